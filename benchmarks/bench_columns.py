@@ -0,0 +1,88 @@
+# bench_columns.py - Python lists vs columns.ColumnTable for list-view queries
+#
+#   python benchmarks/bench_columns.py [--sizes 10000,1000000,10000000]
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from columns import ColumnTable  # noqa: E402
+
+GROUPS = ["alpha", "beta", "gamma", "delta", "epsilon"]
+
+
+def make_rows(n, seed=0):
+    rng = random.Random(seed)
+    names = [f"Item {i} {rng.choice(GROUPS)}" for i in range(n)]
+    sizes = [rng.randrange(1_000_000) for _ in range(n)]
+    groups = [rng.choice(GROUPS) for _ in range(n)]
+    return names, sizes, groups
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def bench_lists(names, sizes, groups, query):
+    def filt():
+        q = query.lower()
+        return [i for i, x in enumerate(names) if q in x.lower()]
+
+    def sort():
+        return sorted(range(len(sizes)), key=sizes.__getitem__)
+
+    def top_k():
+        return sorted(range(len(sizes)), key=sizes.__getitem__, reverse=True)[:100]
+
+    def group():
+        counts = {}
+        for g in groups:
+            counts[g] = counts.get(g, 0) + 1
+        return counts
+
+    return {
+        "filter": timed(filt),
+        "sort": timed(sort),
+        "top_k": timed(top_k),
+        "group_count": timed(group),
+    }
+
+
+def bench_columns(names, sizes, groups, query):
+    table = ColumnTable({"name": names, "size": sizes, "group": groups})
+    table.contains("name", "")  # Fold once, as a long-lived view would
+
+    return {
+        "filter": timed(lambda: table.where(table.contains("name", query))),
+        "sort": timed(lambda: table.sort("size")),
+        "top_k": timed(lambda: table.top_k("size", 100)),
+        "group_count": timed(lambda: table.group_count("group")),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lists vs ColumnTable")
+    parser.add_argument("--sizes", default="10000,1000000,10000000")
+    parser.add_argument("--query", default="gamma")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10} {'op':<12} {'lists ms':>10} {'numpy ms':>10} {'speedup':>8}")
+    for n in (int(s) for s in args.sizes.split(",")):
+        names, sizes, groups = make_rows(n)
+        py = bench_lists(names, sizes, groups, args.query)
+        np_ = bench_columns(names, sizes, groups, args.query)
+        for op in py:
+            speedup = py[op] / np_[op] if np_[op] else float("inf")
+            print(
+                f"{n:>10} {op:<12} {py[op] * 1000:>10.1f} "
+                f"{np_[op] * 1000:>10.1f} {speedup:>7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# bench_persistent.py - Copy-on-append lists vs persistent.PVector / PMap
+#
+#   python benchmarks/bench_persistent.py [--n 100000] [--keep-every 1000]
+#
+# Each run appends n items the way component state does it (a new value per
+# update, old value still referenced by the previous render) and reports
+# wall time plus tracemalloc peak and retained memory when every
+# `keep_every`-th version is kept alive, as undo history or pending renders do.
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from persistent import PMap, PVector  # noqa: E402
+
+
+def list_appends(n, keep_every):
+    items, kept = [], []
+    for i in range(n):
+        items = items + [i]
+        if keep_every and i % keep_every == 0:
+            kept.append(items)
+    return items, kept
+
+
+def pvector_appends(n, keep_every):
+    items, kept = PVector(), []
+    for i in range(n):
+        items = items.append(i)
+        if keep_every and i % keep_every == 0:
+            kept.append(items)
+    return items, kept
+
+
+def dict_updates(n, keep_every):
+    m, kept = {}, []
+    for i in range(n):
+        m = {**m, i: i}
+        if keep_every and i % keep_every == 0:
+            kept.append(m)
+    return m, kept
+
+
+def pmap_updates(n, keep_every):
+    m, kept = PMap(), []
+    for i in range(n):
+        m = m.set(i, i)
+        if keep_every and i % keep_every == 0:
+            kept.append(m)
+    return m, kept
+
+
+def measure(fn, n, keep_every):
+    start = time.perf_counter()
+    fn(n, keep_every)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    result = fn(n, keep_every)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, current, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Persistent collections")
+    parser.add_argument("--n", type=int, default=100_000)
+    parser.add_argument("--keep-every", type=int, default=1000)
+    parser.add_argument(
+        "--skip-copies", action="store_true",
+        help="skip the quadratic list/dict copy baselines",
+    )
+    args = parser.parse_args(argv)
+
+    cases = [
+        ("list + [x]", list_appends, True),
+        ("PVector.append", pvector_appends, False),
+        ("{**d, k: v}", dict_updates, True),
+        ("PMap.set", pmap_updates, False),
+    ]
+    print(f"n={args.n} keep_every={args.keep_every}")
+    print(f"{'case':<16} {'time s':>9} {'retained MB':>12} {'peak MB':>9}")
+    for name, fn, quadratic in cases:
+        if quadratic and args.skip_copies:
+            continue
+        elapsed, current, peak = measure(fn, args.n, args.keep_every)
+        print(
+            f"{name:<16} {elapsed:>9.3f} {current / 2**20:>12.1f} "
+            f"{peak / 2**20:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+# run.py - Run the reconciliation benchmarks and compare against baselines
+#
+#   python benchmarks/run.py                     # compare with baselines.json
+#   python benchmarks/run.py --update            # record new baselines
+#   python benchmarks/run.py -k keyed --threshold 0.5
+#   python benchmarks/run.py --time-threshold 0.5  # also gate on wall time
+#
+# Every scenario runs on the headless backend. For each one the runner
+# reports the best wall time over --repeat runs, the tracemalloc peak of one
+# extra run, and the widget operations counted by the backend. The exit
+# status is 1 when operations or allocations regress past their threshold
+# (a fraction of the baseline). Wall times depend on the machine the
+# baselines were recorded on, so slower times are only reported as SLOWER
+# unless --time-threshold is given.
+#
+# Each scenario runs in its own interpreter, so module state left behind by
+# an earlier scenario (caches, patched clocks, objects awaiting collection)
+# cannot change its allocations; record baselines from a full run.
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import vdom  # noqa: E402
+from headless import HeadlessBackend  # noqa: E402
+from scenarios import SCENARIOS  # noqa: E402
+
+BASELINES = os.path.join(HERE, "baselines.json")
+ADVISORY_TIME_THRESHOLD = 0.50  # Slowdown reported without --time-threshold
+
+
+def _run_once(setup, traced=False):
+    # A fresh backend per run keeps ops from earlier runs (e.g. generators
+    # finalized late) out of the count.
+    backend = HeadlessBackend()
+    vdom.set_backend(backend)
+    run = setup(backend)
+    gc.collect()
+    backend.reset()
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    run()
+    elapsed = time.perf_counter() - start
+    ops = dict(backend.ops)  # Before teardown (e.g. set_backend) adds any
+    peak = 0
+    if traced:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return elapsed, peak, ops
+
+
+def measure(setup, repeat):
+    previous = vdom.get_backend()
+    try:
+        best = min(_run_once(setup)[0] for _ in range(repeat))
+        _, peak, ops = _run_once(setup, traced=True)
+    finally:
+        vdom.set_backend(previous)
+
+    return {
+        "time_ms": round(best * 1000, 3),
+        "alloc_kb": round(peak / 1024, 1),
+        "ops": sum(ops.values()),
+        "ops_detail": dict(sorted(ops.items())),
+    }
+
+
+def measure_isolated(name, repeat):
+    """measure() in a fresh interpreter."""
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--scenario", name,
+         "--repeat", str(repeat)],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise RuntimeError(f"scenario {name} failed")
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+def compare(name, result, baseline, thresholds):
+    failures = []
+    for metric, limit in thresholds.items():
+        base = baseline.get(metric)
+        if base is None:
+            continue
+        if result[metric] > base * (1 + limit) and result[metric] - base > 1:
+            failures.append(
+                f"{name}: {metric} {result[metric]} > baseline {base} "
+                f"(+{limit:.0%})"
+            )
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="vdom benchmarks")
+    parser.add_argument("-k", "--filter", default="", help="substring of scenario names")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed regression for widget operations")
+    parser.add_argument("--alloc-threshold", type=float, default=0.25,
+                        help="allowed regression for tracemalloc peak")
+    parser.add_argument("--time-threshold", type=float, default=None,
+                        help="allowed regression for wall time; gates the "
+                             "exit status only when given")
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument("--update", action="store_true",
+                        help="write results as the new baselines")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS)  # Child mode
+    args = parser.parse_args(argv)
+
+    if args.scenario:
+        print(json.dumps(measure(SCENARIOS[args.scenario], args.repeat)))
+        return 0
+
+    baselines = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines) as f:
+            baselines = json.load(f)
+
+    results = {}
+    failures = []
+    slower = []
+    print(f"{'scenario':<22} {'time ms':>10} {'alloc KB':>10} {'ops':>8}")
+    for name, setup in SCENARIOS.items():
+        if args.filter not in name:
+            continue
+        result = measure_isolated(name, args.repeat)
+        results[name] = result
+        print(
+            f"{name:<22} {result['time_ms']:>10.2f} "
+            f"{result['alloc_kb']:>10.1f} {result['ops']:>8}"
+        )
+        if not args.update and name in baselines:
+            failures += compare(name, result, baselines[name], {
+                "ops": args.threshold,
+                "alloc_kb": args.alloc_threshold,
+            })
+            timing = compare(name, result, baselines[name], {
+                "time_ms": args.time_threshold or ADVISORY_TIME_THRESHOLD,
+            })
+            if args.time_threshold is not None:
+                failures += timing
+            else:
+                slower += timing
+
+    if args.update:
+        baselines.update(results)
+        with open(args.baselines, "w") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Wrote {len(results)} baselines to {args.baselines}")
+        return 0
+
+    for note in slower:
+        print("SLOWER", note)
+    for failure in failures:
+        print("REGRESSION", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,454 @@
+# scenarios.py - Reconciliation scenarios for benchmarks/run.py
+#
+# Each scenario takes the HeadlessBackend (already installed in vdom), does
+# its setup and returns a zero-argument callable: the part that is measured.
+# Setup must be deterministic so operation counts are comparable run to run.
+import itertools
+import os
+import random
+import sys
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from vdom import (  # noqa: E402
+    create_element, h, layout_batch, patch_children, patch_recursive,
+)
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    def register(fn):
+        SCENARIOS[name] = fn
+        return fn
+    return register
+
+
+# -------------------------
+# Tree builders
+# -------------------------
+def flat_tree(n):
+    """A div holding rows of (span, button) pairs: n nodes in total."""
+    rows = []
+    for i in range(n // 3):
+        rows.append(h("div", {"class": "row"}, [
+            h("span", {"text": f"Row {i}"}),
+            h("button", {"text": "Edit"}),
+        ], key=i))
+    return h("div", {"class": "table"}, rows)
+
+
+def deep_tree(depth, width, leaf_text="leaf"):
+    """`depth` nested divs with `width` spans beside each level."""
+    node = h("span", {"text": leaf_text})
+    for level in range(depth):
+        siblings = [h("span", {"text": f"L{level} #{j}"}) for j in range(width)]
+        node = h("div", {"class": f"level-{level}"}, siblings + [node])
+    return node
+
+
+def keyed_list(keys):
+    return h("div", {"class": "list"}, [
+        h("div", {"class": "item"}, [h("span", {"text": f"Item {k}"})], key=k)
+        for k in keys
+    ])
+
+
+def mount(backend, vnode):
+    root = backend.root()
+    host = backend.create("div", root)
+    with layout_batch():  # As ComponentMount does for each commit
+        create_element(vnode, host)
+    return host
+
+
+def find_widget(widget, pred):
+    if pred(widget):
+        return widget
+    for child in widget.winfo_children():
+        found = find_widget(child, pred)
+        if found is not None:
+            return found
+    return None
+
+
+# -------------------------
+# Scenarios
+# -------------------------
+@scenario("h_build_10k")
+def h_build_10k(backend):
+    return lambda: flat_tree(10_000)
+
+
+@scenario("mount_1k")
+def mount_1k(backend):
+    vnode = flat_tree(1_000)
+    return lambda: mount(backend, vnode)
+
+
+@scenario("mount_10k")
+def mount_10k(backend):
+    vnode = flat_tree(10_000)
+    return lambda: mount(backend, vnode)
+
+
+@scenario("headings_mount_1k")
+def headings_mount_1k(backend):
+    """Headings and spans sharing a few fonts: one named font per spec."""
+    vnode = h("div", {}, [
+        h("h2", {"text": f"Section {i}"}) if i % 2 else
+        h("span", {"text": f"Note {i}", "font": ("Cascadia Mono", 11 + i % 3)})
+        for i in range(1_000)
+    ])
+    return lambda: mount(backend, vnode)
+
+
+@contextmanager
+def virtual_clock():
+    """Chunk boundaries that do not depend on machine speed: every clock
+    read advances 10 us, i.e. one element per read."""
+    import progressive
+
+    ticks = itertools.count()
+    saved = progressive.clock
+    progressive.clock = lambda: next(ticks) / 100_000
+    try:
+        yield
+    finally:
+        progressive.clock = saved
+
+
+@scenario("progressive_first_frame_5k")
+def progressive_first_frame_5k(backend):
+    """What a progressive mount of 5k rows builds before the first paint."""
+    rows = flat_tree(15_000).children
+    vnode = h("div", {"class": "table", "progressive": True}, rows)
+
+    def run():
+        with virtual_clock():
+            mount(backend, vnode)
+
+    return run
+
+
+@scenario("progressive_mount_5k")
+def progressive_mount_5k(backend):
+    """A whole progressive mount of 5k rows, with a patch merged midway."""
+    rows = flat_tree(15_000).children
+    old = h("div", {"class": "table", "progressive": True}, rows)
+    new = h("div", {"class": "table", "progressive": True},
+            flat_tree(15_003).children)
+
+    def run():
+        with virtual_clock():
+            host = mount(backend, old)
+            root = host.winfo_toplevel()
+            root.advance(5)  # A few chunks in
+            patch_recursive(host, old, new)
+            while host.winfo_children()[0]._progressive is not None:
+                root.advance(1)
+
+    return run
+
+
+@scenario("deep_single_prop")
+def deep_single_prop(backend):
+    old = deep_tree(60, 8)
+    new = deep_tree(60, 8, leaf_text="changed")
+    host = mount(backend, old)
+    return lambda: patch_recursive(host, old, new)
+
+
+def _keyed(backend, reorder, n=1_000):
+    keys = list(range(n))
+    old = keyed_list(keys)
+    new = keyed_list(reorder(keys))
+    host = mount(backend, old)
+    widget = host.winfo_children()[0]
+    return lambda: patch_children(widget, old.children, new.children)
+
+
+@scenario("keyed_append")
+def keyed_append(backend):
+    return _keyed(backend, lambda keys: keys + [len(keys)])
+
+
+@scenario("keyed_prepend")
+def keyed_prepend(backend):
+    return _keyed(backend, lambda keys: [-1] + keys)
+
+
+@scenario("keyed_reverse")
+def keyed_reverse(backend):
+    return _keyed(backend, lambda keys: keys[::-1])
+
+
+@scenario("keyed_shuffle")
+def keyed_shuffle(backend):
+    def shuffle(keys):
+        keys = list(keys)
+        random.Random(42).shuffle(keys)
+        return keys
+    return _keyed(backend, shuffle)
+
+
+@scenario("keyed_replace_idle")
+def keyed_replace_idle(backend):
+    """The idle flush after replacing a 1000-item keyed list: the removed
+    rows are destroyed here, not in the commit."""
+    old = keyed_list(range(1_000))
+    new = keyed_list(range(1_000, 2_000))
+    host = mount(backend, old)
+    patch_children(host.winfo_children()[0], old.children, new.children)
+    return host.winfo_toplevel().update_idletasks
+
+
+@scenario("listbox_narrow_10k")
+def listbox_narrow_10k(backend):
+    items = [f"Item {i}" for i in range(10_000)]
+    old = h("ul", {}, items)
+    new = h("ul", {}, [x for x in items if "7" in x])
+    host = mount(backend, old)
+    return lambda: patch_recursive(host, old, new)
+
+
+@scenario("rerender_callbacks")
+def rerender_callbacks(backend):
+    """Re-render 200 buttons with fresh closures, as components do."""
+    def render(generation):
+        return h("div", {"class": "toolbar"}, [
+            h("button", {"text": f"Action {i}", "command": lambda: generation})
+            for i in range(200)
+        ])
+
+    old = render(0)
+    host = mount(backend, old)
+
+    def run():
+        prev = old
+        for generation in range(1, 11):
+            new = render(generation)
+            patch_recursive(host, prev, new)
+            prev = new
+
+    return run
+
+
+def cells(n, as_items, label="Cell"):
+    """n labels in a 100-column grid, as widgets or as canvas items."""
+    if as_items:
+        return h("canvas", {"width": 4000, "height": 2000}, [
+            h("span", {"x": (i % 100) * 40, "y": (i // 100) * 16,
+                       "text": f"{label} {i}"})
+            for i in range(n)
+        ])
+    return h("div", {"class": "cells"}, [
+        h("span", {"text": f"{label} {i}",
+                   "layout": {"grid": {"row": i // 100, "column": i % 100}}})
+        for i in range(n)
+    ])
+
+
+@scenario("cells_mount_10k")
+def cells_mount_10k(backend):
+    vnode = cells(10_000, as_items=False)
+    return lambda: mount(backend, vnode)
+
+
+@scenario("canvas_mount_10k")
+def canvas_mount_10k(backend):
+    vnode = cells(10_000, as_items=True)
+    return lambda: mount(backend, vnode)
+
+
+def _relabel(backend, as_items):
+    old = cells(10_000, as_items)
+    new = cells(10_000, as_items, label="Value")
+    host = mount(backend, old)
+    return lambda: patch_recursive(host, old, new)
+
+
+@scenario("cells_update_10k")
+def cells_update_10k(backend):
+    return _relabel(backend, as_items=False)
+
+
+@scenario("canvas_update_10k")
+def canvas_update_10k(backend):
+    return _relabel(backend, as_items=True)
+
+
+def table_rows(n):
+    from persistent import PVector
+
+    return PVector().extend(
+        (f"file{i}", (i * 7919) % 100_000, f"owner{i % 37}") for i in range(n)
+    )
+
+
+TABLE_COLUMNS = [
+    {"key": "name", "title": "Name"},
+    {"key": "size", "title": "Size", "anchor": "e"},
+    {"key": "owner", "title": "Owner"},
+]
+
+
+@scenario("table_mount_100k")
+def table_mount_100k(backend):
+    rows = table_rows(100_000)
+    vnode = h("table", {"columns": TABLE_COLUMNS, "rows": rows, "height": 30})
+    return lambda: mount(backend, vnode)
+
+
+@scenario("table_sort_scroll_100k")
+def table_sort_scroll_100k(backend):
+    """Sort by two columns in both directions, scrolling 50 rows each."""
+    rows = table_rows(100_000)
+    host = mount(backend, h("table", {
+        "columns": TABLE_COLUMNS, "rows": rows, "height": 30,
+    }))
+    tree = host.winfo_children()[0]
+
+    def run():
+        for column in ("size", "size", "owner", "owner"):
+            tree.heading_click(column)
+            for _ in range(50):
+                tree.event_generate("<MouseWheel>", delta=-120)
+
+    return run
+
+
+@scenario("log_ingest_50k")
+def log_ingest_50k(backend):
+    """One second of a 50k lines/s log stream into a 5000-line log."""
+    from logview import FRAME_MS, LogStream
+
+    stream = LogStream(max_lines=5_000)
+    host = mount(backend, h("log", {"stream": stream, "height": 40}))
+    root = host.winfo_toplevel()
+    per_frame = 50_000 * FRAME_MS // 1000
+    lines = [f"2026-01-01 12:00:00 INFO worker {i} handled request" for i in range(per_frame)]
+
+    def run():
+        for _ in range(1000 // FRAME_MS):
+            stream.extend(lines)
+            root.advance(FRAME_MS)
+
+    return run
+
+
+# -------------------------
+# App-level scenarios
+# -------------------------
+def start_app(backend):
+    from multi_view_with_portal import MultiViewWithPortal
+    from runner import run_component
+
+    root = backend.root()
+    app_frame = backend.create("div", root)
+    app_frame.pack(fill="both", expand=True)
+    external = backend.create("div", root)
+    external.pack(fill="x")
+    app = run_component(
+        MultiViewWithPortal({"title": "Bench"}, app_frame, external)
+    )
+    tick = 0
+
+    def step():
+        nonlocal tick
+        tick += 1
+        app.send({"tick": tick})
+        root.advance(20)
+
+    step()
+    return root, app_frame, step
+
+
+def click(frame, text):
+    button = find_widget(
+        frame, lambda w: w.options.get("text") == text and hasattr(w, "invoke")
+    )
+    button.invoke()
+
+
+@scenario("app_first_frame")
+def app_first_frame(backend):
+    """Startup up to the first idle: what is built before first paint."""
+    from replay import build_app
+
+    apps = []  # Keeps the generators alive until the run is measured
+
+    def run():
+        root, app = build_app(backend)
+        root.update()
+        apps.append(app)
+
+    return run
+
+
+@scenario("tab_switch")
+def tab_switch(backend):
+    root, frame, step = start_app(backend)
+
+    def run():
+        for tab in ("List", "Counter") * 5:
+            click(frame, tab)
+            step()
+            step()
+
+    return run
+
+
+def list_with_items(backend, n):
+    root, frame, step = start_app(backend)
+    click(frame, "List")
+    step()
+    step()
+    for _ in range(n):
+        click(frame, "Add")
+        root.update()
+    step()
+    entry = find_widget(frame, lambda w: backend.is_entry(w))
+    return root, step, entry
+
+
+@scenario("filter_typing_2k")
+def filter_typing_2k(backend):
+    from list_view import FILTER_DEBOUNCE_MS
+
+    root, step, entry = list_with_items(backend, 2_000)
+
+    def run():
+        for ch in "item 1":
+            entry.type(ch)
+            root.advance(20)
+        for _ in range(6):
+            entry.delete(len(entry.get()) - 1)
+            entry.event_generate("<KeyRelease>")
+            root.advance(20)
+        root.advance(FILTER_DEBOUNCE_MS)  # Let the debounced render run
+        step()  # Also keeps the app (and its generators) alive until here
+
+    return run
+
+
+@scenario("typing_render_2k")
+def typing_render_2k(backend):
+    """Slow typing: every key re-renders the 2k-item list and the
+    controlled input behind it."""
+    from list_view import FILTER_DEBOUNCE_MS
+
+    root, step, entry = list_with_items(backend, 2_000)
+
+    def run():
+        for ch in "item 1":
+            entry.type(ch)
+            root.advance(FILTER_DEBOUNCE_MS)
+        for _ in range(6):
+            entry.delete(len(entry.get()) - 1)
+            entry.event_generate("<KeyRelease>")
+            root.advance(FILTER_DEBOUNCE_MS)
+        step()
+
+    return run
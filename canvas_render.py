@@ -0,0 +1,218 @@
+# canvas_render.py - Draw vnodes as canvas items instead of widgets
+#
+#   h("canvas", {"width": 800, "height": 600}, [
+#       h("div", {"x": 10, "y": 10, "width": 120, "height": 20,
+#                 "fill": "#eee", "on_click": on_cell}, [
+#           h("span", {"x": 4, "y": 2, "text": "Cell 1"}),
+#       ]),
+#   ])
+#
+# Children of a `canvas` element become items on that canvas: a span (or a
+# plain string) is a text item, a div is a rectangle when it has a fill or an
+# outline and always positions its children relative to its own x/y. One
+# item costs a single Tcl call to create and nothing to lay out, so dense
+# views (thousands of labels and cells) stay cheap. Patches change only the
+# options and coordinates that differ (itemconfigure/coords) and removed
+# subtrees go in one `delete`. Clicks are hit-tested against the items under
+# the pointer; the nearest node with an on_click prop handles the event.
+import resources
+from vdom import ElementVNode, TextVNode, get_backend, nodes_equal, same_node
+
+TEXT_TAGS = ("span", "text")
+
+# Item options per kind, with the value Tk uses when one is not given
+TEXT_OPTIONS = {
+    "text": "", "fill": "black", "font": "TkDefaultFont", "anchor": "nw",
+    "justify": "left", "wrap": 0,
+}
+RECT_OPTIONS = {"fill": "", "outline": "black", "outline_width": 1}
+
+# Prop names that differ from the Tk option they set
+OPTION_NAMES = {"wrap": "width", "outline_width": "width"}
+
+
+class CanvasNode:
+    __slots__ = ("vnode", "parent", "item", "x", "y", "children")
+
+    def __init__(self, vnode, parent, x, y):
+        self.vnode = vnode
+        self.parent = parent
+        self.item = None
+        self.x = x
+        self.y = y
+        self.children = []
+
+
+def _props(vnode):
+    if isinstance(vnode, ElementVNode):
+        return vnode.props
+    text = vnode.text if isinstance(vnode, TextVNode) else str(vnode)
+    return {"text": text}
+
+
+def _is_text(vnode):
+    return not isinstance(vnode, ElementVNode) or vnode.tag in TEXT_TAGS
+
+
+def _children(vnode):
+    if isinstance(vnode, ElementVNode) and vnode.tag not in TEXT_TAGS:
+        return [c for c in vnode.children if c is not None]
+    return []
+
+
+def _options(vnode, props):
+    if _is_text(vnode):
+        options, defaults = {"anchor": "nw"}, TEXT_OPTIONS
+    else:
+        options, defaults = {}, RECT_OPTIONS
+    for k in defaults:
+        if k in props:
+            options[OPTION_NAMES.get(k, k)] = props[k]
+    return options
+
+
+def _resolve_font(canvas, options):
+    # Text items share the named fonts element widgets use
+    if options.get("font"):
+        options["font"] = resources.font(get_backend(), canvas, options["font"])
+    return options
+
+
+def _coords(vnode, props, x, y):
+    if _is_text(vnode):
+        return (x, y)
+    return (x, y, x + props.get("width", 0), y + props.get("height", 0))
+
+
+def _draws(vnode, props):
+    """Text always gets an item; a div only when something is visible."""
+    return _is_text(vnode) or "fill" in props or "outline" in props
+
+
+def _state(canvas):
+    state = getattr(canvas, "_canvas_state", None)
+    if state is None:
+        state = {"roots": [], "items": {}}
+        setattr(canvas, "_canvas_state", state)
+        try:
+            canvas.bind("<Button-1>", lambda e: _on_click(canvas, e), add="+")
+        except Exception:
+            pass
+    return state
+
+
+# -------------------------
+# Mount / patch
+# -------------------------
+def mount(canvas, children):
+    state = _state(canvas)
+    state["roots"] = [
+        _create(canvas, state, c, 0, 0, None) for c in children if c is not None
+    ]
+
+
+def patch(canvas, new_children):
+    state = _state(canvas)
+    state["roots"] = _patch_list(
+        canvas, state, state["roots"],
+        [c for c in new_children if c is not None], 0, 0, None,
+    )
+
+
+def _create(canvas, state, vnode, ox, oy, parent):
+    props = _props(vnode)
+    x, y = ox + props.get("x", 0), oy + props.get("y", 0)
+    node = CanvasNode(vnode, parent, x, y)
+    if _draws(vnode, props):
+        coords = _coords(vnode, props, x, y)
+        create = canvas.create_text if _is_text(vnode) else canvas.create_rectangle
+        options = _resolve_font(canvas, _options(vnode, props))
+        node.item = create(*coords, **options)
+        state["items"][node.item] = node
+    node.children = [_create(canvas, state, c, x, y, node) for c in _children(vnode)]
+    return node
+
+
+def _patch_list(canvas, state, nodes, vnodes, ox, oy, parent):
+    out = [
+        _patch_node(canvas, state, node, vnode, ox, oy, parent)
+        for node, vnode in zip(nodes, vnodes)
+    ]
+    if len(nodes) > len(vnodes):
+        _delete(canvas, state, nodes[len(vnodes):])
+    for vnode in vnodes[len(nodes):]:
+        out.append(_create(canvas, state, vnode, ox, oy, parent))
+    return out
+
+
+def _patch_node(canvas, state, node, vnode, ox, oy, parent):
+    old = node.vnode
+    old_props, props = _props(old), _props(vnode)
+    x, y = ox + props.get("x", 0), oy + props.get("y", 0)
+    if (
+        not same_node(old, vnode)
+        or _is_text(old) != _is_text(vnode)
+        or _draws(old, old_props) != _draws(vnode, props)
+    ):
+        _delete(canvas, state, [node])
+        return _create(canvas, state, vnode, ox, oy, parent)
+
+    moved = (x, y) != (node.x, node.y)
+    if not moved and nodes_equal(old, vnode):
+        node.vnode = vnode
+        return node
+
+    if node.item is not None:
+        defaults = TEXT_OPTIONS if _is_text(vnode) else RECT_OPTIONS
+        changed = {
+            OPTION_NAMES.get(k, k): props.get(k, default)
+            for k, default in defaults.items()
+            if old_props.get(k, default) != props.get(k, default)
+        }
+        if changed:
+            canvas.itemconfigure(node.item, **_resolve_font(canvas, changed))
+        coords = _coords(vnode, props, x, y)
+        if coords != _coords(old, old_props, node.x, node.y):
+            canvas.coords(node.item, *coords)
+
+    node.vnode, node.x, node.y = vnode, x, y
+    node.children = _patch_list(
+        canvas, state, node.children, _children(vnode), x, y, node
+    )
+    return node
+
+
+def _delete(canvas, state, nodes):
+    """Delete the items of `nodes` and their subtrees in one call."""
+    items = []
+    stack = list(nodes)
+    while stack:
+        node = stack.pop()
+        if node.item is not None:
+            items.append(node.item)
+            state["items"].pop(node.item, None)
+        stack.extend(node.children)
+    if items:
+        canvas.delete(*items)
+
+
+# -------------------------
+# Events
+# -------------------------
+def hit_test(canvas, x, y):
+    """Innermost node under canvas coordinates (x, y), or None."""
+    items = _state(canvas)["items"]
+    for item in reversed(canvas.find_overlapping(x, y, x, y)):
+        node = items.get(item)
+        if node is not None:
+            return node
+    return None
+
+
+def _on_click(canvas, event):
+    node = hit_test(canvas, canvas.canvasx(event.x), canvas.canvasy(event.y))
+    while node is not None:
+        handler = _props(node.vnode).get("on_click")
+        if handler is not None:
+            return handler(event)
+        node = node.parent
@@ -0,0 +1,184 @@
+# columns.py - Optional NumPy-backed columnar data for list and table views
+try:
+    import numpy as np
+except ImportError:  # Optional: pip install "tkinterreactive[columnar]"
+    np = None
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "columns requires numpy; install tkinterreactive[columnar]"
+        )
+
+
+class ColumnView:
+    """Read-only sequence of one column at the given row indices.
+
+    Passed as the `items` prop of a `ul`, it lets the Listbox path take
+    rows straight from the array instead of a Python list built in render.
+    Elements are converted to Python strings only when read.
+    """
+
+    __slots__ = ("values", "indices")
+
+    def __init__(self, values, indices=None):
+        self.values = values
+        self.indices = indices
+
+    def _selected(self):
+        if self.indices is None:
+            return self.values
+        return self.values[self.indices]
+
+    def __len__(self):
+        if self.indices is None:
+            return len(self.values)
+        return len(self.indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            if self.indices is None:
+                return ColumnView(self.values[i])
+            return ColumnView(self.values, self.indices[i])
+        row = i if self.indices is None else self.indices[i]
+        return str(self.values[row])
+
+    def __iter__(self):
+        return iter(self.tolist())
+
+    def tolist(self):
+        return [str(v) for v in self._selected().tolist()]
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, ColumnView):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        if self.values is other.values:
+            if self.indices is other.indices:
+                return True
+            if self.indices is not None and other.indices is not None:
+                return bool(np.array_equal(self.indices, other.indices))
+        return bool(np.array_equal(self._selected(), other._selected()))
+
+    def __ne__(self, other):
+        eq = self.__eq__(other)
+        return eq if eq is NotImplemented else not eq
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"ColumnView(len={len(self)})"
+
+
+class ColumnTable:
+    """Named, equal-length NumPy columns with vectorized queries.
+
+    Query methods take and return row index arrays, so filters, sorts and
+    top-k selections compose without materializing rows:
+
+        rows = table.where(table.contains("name", "foo"))
+        rows = table.sort("size", rows, descending=True)
+        h("ul", {"items": table.view("name", rows)})
+    """
+
+    def __init__(self, columns):
+        _require_numpy()
+        self.columns = {}
+        self._folded = {}
+        length = None
+        for name, values in columns.items():
+            arr = np.asarray(values)
+            if length is None:
+                length = len(arr)
+            elif len(arr) != length:
+                raise ValueError(
+                    f"column {name!r} has {len(arr)} rows, expected {length}"
+                )
+            self.columns[name] = arr
+        self.length = length or 0
+
+    def __len__(self):
+        return self.length
+
+    def column(self, name):
+        return self.columns[name]
+
+    def extend(self, columns):
+        """Append rows given as {name: values}; every column must be given."""
+        added = None
+        for name in self.columns:
+            arr = np.asarray(columns[name])
+            if added is None:
+                added = len(arr)
+            elif len(arr) != added:
+                raise ValueError("extend() columns differ in length")
+            self.columns[name] = np.concatenate([self.columns[name], arr])
+        self.length += added or 0
+        self._folded.clear()
+
+    def _all(self, indices):
+        if indices is None:
+            return np.arange(self.length)
+        return indices
+
+    def contains(self, name, text, case=False):
+        """Boolean mask of rows whose string column contains `text`."""
+        values = self.columns[name]
+        if not case:
+            if name not in self._folded:
+                self._folded[name] = np.char.lower(values.astype(str))
+            values = self._folded[name]
+            text = text.lower()
+        return np.char.find(values, text) >= 0
+
+    def where(self, mask, indices=None):
+        """Row indices where `mask` holds, optionally restricted to `indices`."""
+        if indices is None:
+            return np.flatnonzero(mask)
+        return indices[mask[indices]]
+
+    def sort(self, name, indices=None, descending=False):
+        indices = self._all(indices)
+        order = np.argsort(self.columns[name][indices], kind="stable")
+        if descending:
+            order = order[::-1]
+        return indices[order]
+
+    def top_k(self, name, k, indices=None, largest=True):
+        """Indices of the k largest (or smallest) rows, in sorted order."""
+        indices = self._all(indices)
+        k = min(k, len(indices))
+        if k == 0:
+            return indices[:0]
+        values = self.columns[name][indices]
+        if largest:
+            part = np.argpartition(values, len(values) - k)[-k:]
+            part = part[np.argsort(values[part], kind="stable")[::-1]]
+        else:
+            part = np.argpartition(values, k - 1)[:k]
+            part = part[np.argsort(values[part], kind="stable")]
+        return indices[part]
+
+    def group_count(self, name, indices=None):
+        """(keys, counts) for each distinct value of a column."""
+        values = self.columns[name]
+        if indices is not None:
+            values = values[indices]
+        return np.unique(values, return_counts=True)
+
+    def group_sum(self, by, value, indices=None):
+        """(keys, sums) of column `value` grouped by column `by`."""
+        keys = self.columns[by]
+        values = self.columns[value]
+        if indices is not None:
+            keys = keys[indices]
+            values = values[indices]
+        uniq, inverse = np.unique(keys, return_inverse=True)
+        return uniq, np.bincount(inverse, weights=values, minlength=len(uniq))
+
+    def view(self, name, indices=None):
+        return ColumnView(self.columns[name], indices)
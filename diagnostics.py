@@ -0,0 +1,230 @@
+# diagnostics.py - Leak detection for long-running sessions
+#
+#   before = snapshot(root)
+#   ... switch tabs N times ...
+#   print(format_diff(diff(before, snapshot(root))))
+#
+#   soak(step, root, rounds=200)   # raises LeakDetected on unbounded growth
+#
+#   python diagnostics.py --switches 200   # headless tab-switch soak test
+import argparse
+import gc
+import sys
+import tracemalloc
+from collections import Counter
+
+import vdom
+from vdom import ComponentVNode, ElementVNode, FragmentVNode, PortalVNode, TextVNode
+
+VNODE_TYPES = (ElementVNode, TextVNode, PortalVNode, ComponentVNode, FragmentVNode)
+
+
+class LeakDetected(AssertionError):
+    pass
+
+
+def _widget_label(widget):
+    vnode = getattr(widget, "_vnode", None)
+    if isinstance(vnode, ElementVNode):
+        return vnode.tag
+    if isinstance(vnode, ComponentVNode):
+        return "<component>"
+    if isinstance(vnode, PortalVNode):
+        return "<portal>"
+    if isinstance(vnode, TextVNode):
+        return "<text>"
+    return type(widget).__name__
+
+
+def _walk(widget):
+    yield widget
+    for child in widget.winfo_children():
+        yield from _walk(child)
+
+
+def tcl_command_count(root):
+    """Commands in the Tcl interpreter, or None for non-Tk backends."""
+    tk = getattr(root, "tk", None)
+    if tk is None:
+        return None
+    return len(tk.splitlist(tk.call("info", "commands")))
+
+
+def snapshot(root, top=10):
+    """Counts of live widgets, callbacks, vnodes and portals under `root`.
+
+    If tracemalloc is tracing, the `top` allocating lines are included.
+    """
+    widgets = Counter()
+    python_commands = 0
+    for widget in _walk(root):
+        widgets[_widget_label(widget)] += 1
+        python_commands += len(getattr(widget, "_tclCommands", None) or ())
+
+    gc.collect()
+    vnodes = Counter(
+        type(obj).__name__ for obj in gc.get_objects()
+        if isinstance(obj, VNODE_TYPES)
+    )
+
+    traced_bytes = allocations = None
+    if tracemalloc.is_tracing():
+        traced_bytes = tracemalloc.get_traced_memory()[0]
+        if top:
+            allocations = tracemalloc.take_snapshot().statistics("lineno")[:top]
+
+    return {
+        "widgets": widgets,
+        "widget_total": sum(widgets.values()),
+        "tcl_commands": tcl_command_count(root),
+        "python_tcl_commands": python_commands,
+        "vnodes": vnodes,
+        "vnode_total": sum(vnodes.values()),
+        "portal_hosts": len(vdom.MOUNTED),
+        "portal_slots": sum(len(slots) for slots in vdom.MOUNTED.values()),
+        "allocations": allocations,
+        "traced_bytes": traced_bytes,
+    }
+
+
+# Scalar counters compared by diff() and soak()
+METRICS = (
+    "widget_total", "tcl_commands", "python_tcl_commands",
+    "vnode_total", "portal_hosts", "portal_slots", "traced_bytes",
+)
+
+
+def diff(before, after):
+    """Growth between two snapshots: scalar metrics plus per-tag deltas."""
+    out = {}
+    for metric in METRICS:
+        a, b = before.get(metric), after.get(metric)
+        if a is not None and b is not None and a != b:
+            out[metric] = b - a
+    for group in ("widgets", "vnodes"):
+        delta = Counter(after[group])
+        delta.subtract(before[group])
+        changed = {k: v for k, v in delta.items() if v}
+        if changed:
+            out[group] = changed
+    return out
+
+
+def format_diff(d):
+    lines = []
+    for key, value in d.items():
+        if isinstance(value, dict):
+            parts = ", ".join(f"{k}: {v:+d}" for k, v in sorted(value.items()))
+            lines.append(f"{key}: {parts}")
+        else:
+            lines.append(f"{key}: {value:+d}")
+    return "\n".join(lines) or "no growth"
+
+
+def soak(step, root, rounds=200, samples=5, warmup=5, tolerance=0,
+         byte_tolerance=256 * 1024):
+    """Run `step()` `rounds` times and fail if any counter keeps growing.
+
+    After `warmup` steps a snapshot is taken every rounds/samples steps. A
+    metric that increases at every sample and by more than `tolerance`
+    overall (`byte_tolerance` for traced_bytes, which also sees the
+    snapshots themselves) is treated as unbounded growth and raises
+    LeakDetected. Returns the list of snapshots.
+    """
+    for _ in range(warmup):
+        step()
+    # Only the last snapshot keeps allocation stats, so the snapshots
+    # themselves don't show up as growth in traced_bytes.
+    snaps = [snapshot(root, top=0)]
+    per_sample = max(1, rounds // samples)
+    for i in range(samples):
+        for _ in range(per_sample):
+            step()
+        snaps.append(snapshot(root, top=10 if i == samples - 1 else 0))
+
+    leaks = []
+    for metric in METRICS:
+        values = [s[metric] for s in snaps]
+        if None in values:
+            continue
+        growing = all(b > a for a, b in zip(values, values[1:]))
+        limit = byte_tolerance if metric == "traced_bytes" else tolerance
+        if growing and values[-1] - values[0] > limit:
+            leaks.append(f"{metric}: {values}")
+    if leaks:
+        raise LeakDetected(
+            "Unbounded growth over %d steps:\n  %s\n%s" % (
+                per_sample * samples,
+                "\n  ".join(leaks),
+                format_diff(diff(snaps[0], snaps[-1])),
+            )
+        )
+    return snaps
+
+
+def tab_switch_soak(switches=200, **kwargs):
+    """Headless soak test: switch between the Counter and List tabs."""
+    from headless import HeadlessBackend
+    from replay import build_app
+
+    backend = HeadlessBackend()
+    previous = vdom.get_backend()
+    vdom.set_backend(backend)
+    app = None
+    try:
+        root, app = build_app(backend)
+        tick = 0
+        switches_done = 0
+
+        def find(widget, text):
+            for w in _walk(widget):
+                if w.options.get("text") == text:
+                    return w
+
+        def send():
+            nonlocal tick
+            tick += 1
+            app.send({"tick": tick})
+            root.advance(20)
+
+        send()
+        tabs = ["List", "Counter"]
+
+        def step():
+            nonlocal switches_done
+            # send() advances tick twice per step, so count switches apart
+            find(root, tabs[switches_done % 2]).invoke()
+            switches_done += 1
+            send()
+            send()
+
+        return soak(step, root, rounds=switches, **kwargs)
+    finally:
+        if app is not None:
+            app.close()
+        vdom.set_backend(previous)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless tab-switch soak test")
+    parser.add_argument("--switches", type=int, default=200)
+    parser.add_argument("--tracemalloc", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.tracemalloc:
+        tracemalloc.start(10)
+    try:
+        snaps = tab_switch_soak(args.switches)
+    except LeakDetected as e:
+        print("FAIL", e)
+        return 1
+    print(format_diff(diff(snaps[0], snaps[-1])))
+    if snaps[-1]["allocations"]:
+        for stat in snaps[-1]["allocations"]:
+            print(stat)
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
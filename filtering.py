@@ -0,0 +1,163 @@
+# filtering.py - Incremental substring filtering over large collections
+from array import array
+from collections import defaultdict
+
+
+class FilterDelta:
+    """Difference between two consecutive filter results.
+
+    removed: positions in the previous result that disappeared (ascending)
+    added: positions in the new result that are new (ascending)
+    base, target: the results() lists the delta leads from and to, when
+        FilteredCollection handed them out (see FilteredCollection.delta)
+    """
+
+    __slots__ = ("removed", "added", "base", "target")
+
+    def __init__(self, removed=None, added=None):
+        self.removed = removed or []
+        self.added = added or []
+        self.base = None
+        self.target = None
+
+    def __bool__(self):
+        return bool(self.removed or self.added)
+
+    def __repr__(self):
+        return f"FilterDelta(removed={self.removed!r}, added={self.added!r})"
+
+
+def diff_sorted(old, new):
+    """Diff two ascending index sequences into a FilterDelta."""
+    removed, added = [], []
+    i = j = 0
+    n, m = len(old), len(new)
+    while i < n and j < m:
+        a, b = old[i], new[j]
+        if a == b:
+            i += 1
+            j += 1
+        elif a < b:
+            removed.append(i)
+            i += 1
+        else:
+            added.append(j)
+            j += 1
+    removed.extend(range(i, n))
+    added.extend(range(j, m))
+    return FilterDelta(removed, added)
+
+
+class FilteredCollection:
+    """Case-insensitive substring filter that stays cheap per keystroke.
+
+    Items are case-folded once. A query that contains the previous query
+    only rescans the previous matches; other queries of at least `ngram`
+    characters start from the shortest n-gram posting list instead of
+    the whole collection. Appends update the fold cache, the index and
+    the current matches without re-indexing.
+
+    `delta` is the FilterDelta between the last two lists returned by
+    results(), so a `ul` can apply just those rows:
+
+        h("ul", {"items": coll.results(), "delta": coll.delta})
+
+    It is None, or has no base, when several changes happened in between.
+    """
+
+    def __init__(self, items=(), ngram=3, index=True):
+        self.ngram = ngram
+        self.use_index = index
+        self.items = []
+        self.query = ""
+        self.matches = array("I")
+        self.stats = {"incremental": 0, "indexed": 0, "scans": 0}
+        self._folded = []
+        self._fquery = ""
+        self._index = defaultdict(lambda: array("I"))
+        self._results = None
+        self.delta = None
+        self.extend(items)
+
+    def __len__(self):
+        return len(self.matches)
+
+    def _grams(self, text):
+        n = self.ngram
+        return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+    def extend(self, items):
+        """Append items; returns the FilterDelta of the current result."""
+        start = len(self.items)
+        fq = self._fquery
+        pos = len(self.matches)
+        added = []
+        for i, item in enumerate(items, start):
+            folded = item.casefold()
+            self.items.append(item)
+            self._folded.append(folded)
+            if self.use_index:
+                for gram in self._grams(folded):
+                    self._index[gram].append(i)
+            if fq in folded:
+                self.matches.append(i)
+                added.append(pos)
+                pos += 1
+        delta = FilterDelta(added=added)
+        if added:
+            self._changed(delta)
+        return delta
+
+    def append(self, item):
+        return self.extend((item,))
+
+    def _candidates(self, fq):
+        if self._fquery and self._fquery in fq:
+            self.stats["incremental"] += 1
+            return self.matches
+        if self.use_index and len(fq) >= self.ngram:
+            postings = [self._index.get(g) for g in self._grams(fq)]
+            if any(p is None for p in postings):
+                return ()
+            self.stats["indexed"] += 1
+            return min(postings, key=len)
+        self.stats["scans"] += 1
+        return None
+
+    def set_query(self, query):
+        """Filter by `query`; returns the FilterDelta against the last result."""
+        fq = query.casefold()
+        if fq == self._fquery and query == self.query:
+            return FilterDelta()
+
+        candidates = self._candidates(fq)
+        folded = self._folded
+        if candidates is None:
+            matches = array("I", (
+                i for i, text in enumerate(folded) if fq in text
+            ))
+        else:
+            matches = array("I", (i for i in candidates if fq in folded[i]))
+
+        delta = diff_sorted(self.matches, matches)
+        self.query = query
+        self._fquery = fq
+        self.matches = matches
+        if delta:
+            self._changed(delta)
+        return delta
+
+    def _changed(self, delta):
+        # Relative to the list results() handed out last, if it is current
+        delta.base = self._results
+        self.delta = delta
+        self._results = None
+
+    def results(self):
+        """Matching items, cached until the result changes."""
+        if self._results is None:
+            items = self.items
+            self._results = [items[i] for i in self.matches]
+            if self.delta is not None and self.delta.target is None:
+                self.delta.target = self._results
+        return self._results
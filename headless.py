@@ -0,0 +1,728 @@
+# headless.py - In-memory host backend for running the vdom without a display
+#
+#   from headless import HeadlessBackend
+#   import vdom
+#
+#   backend = HeadlessBackend()
+#   vdom.set_backend(backend)
+#   root = backend.root()
+#   ... mount / patch against root ...
+#   root.update()          # run due after/after_idle callbacks
+#   print(backend.ops)     # Counter of every widget operation
+#
+# Widgets implement the slice of the tkinter API the reconciler, rtk and the
+# scheduler use. Every call is counted in backend.ops so diff cost can be
+# compared deterministically, without Tk's own overhead.
+from collections import Counter
+import heapq
+import itertools
+
+
+class HeadlessEvent:
+    def __init__(self, widget, **fields):
+        self.widget = widget
+        self.x = self.y = self.delta = 0
+        self.char = self.keysym = ""
+        self.__dict__.update(fields)
+
+
+class HeadlessWidget:
+    widget_class = "TFrame"
+
+    def __init__(self, master=None, backend=None, tag="div", **options):
+        self.master = master
+        self.backend = backend or master.backend
+        self.tag = tag
+        self.options = dict(options)
+        self._children = []
+        self._packed = []  # Pack order of children, as `pack slaves` reports
+        self._bindings = {}
+        self._exists = True
+        self.manager = None
+        self.layout = {}
+        if master is not None:
+            master._children.append(self)
+        self.backend.count("create")
+
+    # -- configuration
+    def config(self, cnf=None, **kw):
+        self.backend.count("configure")
+        if cnf:
+            kw = {**cnf, **kw}
+        if not kw:
+            return dict(self.options)
+        self.options.update(kw)
+
+    configure = config
+
+    def cget(self, key):
+        self.backend.count("cget")
+        return self.options.get(key, "")
+
+    def winfo_class(self):
+        return self.widget_class
+
+    # -- geometry
+    def _manage(self, manager, kw, count=True):
+        if count:
+            self.backend.count(manager)
+        before, after = kw.pop("before", None), kw.pop("after", None)
+        packed = self.manager == "pack" and self.master is not None
+        if self.manager != manager:
+            if packed:
+                self.master._packed.remove(self)
+                packed = False
+            self.layout = {}
+        if manager == "pack" and self.master is not None:
+            order = self.master._packed
+            if packed and (before is not None or after is not None):
+                order.remove(self)
+            if before is not None:
+                order.insert(order.index(before), self)
+            elif after is not None:
+                order.insert(order.index(after) + 1, self)
+            elif not packed:
+                order.append(self)
+        self.manager = manager
+        self.layout.update(kw)
+
+    def pack(self, **kw):
+        self._manage("pack", kw)
+
+    pack_configure = pack
+
+    def grid(self, **kw):
+        self._manage("grid", kw)
+
+    grid_configure = grid
+
+    def place(self, **kw):
+        self._manage("place", kw)
+
+    place_configure = place
+
+    def _forget(self, manager):
+        self.backend.count(manager + "_forget")
+        if self.manager == manager:
+            if manager == "pack" and self.master is not None:
+                self.master._packed.remove(self)
+            self.manager = None
+            self.layout = {}
+
+    def pack_forget(self):
+        self._forget("pack")
+
+    def grid_forget(self):
+        self._forget("grid")
+
+    def place_forget(self):
+        self._forget("place")
+
+    def pack_slaves(self):
+        self.backend.count("pack_slaves")
+        return list(self._packed)
+
+    def pack_propagate(self, flag=None):
+        self.backend.count("pack_propagate")
+        if flag is None:
+            return self.options.get("_propagate", True)
+        self.options["_propagate"] = bool(flag)
+
+    # -- tree
+    def winfo_children(self):
+        self.backend.count("children")
+        return list(self._children)
+
+    def winfo_exists(self):
+        self.backend.count("exists")
+        return 1 if self._exists else 0
+
+    def winfo_toplevel(self):
+        w = self
+        while w.master is not None:
+            w = w.master
+        return w
+
+    def _mark_destroyed(self):
+        self._exists = False
+        for handler in list(self._bindings.get("<Destroy>", ())):
+            handler(HeadlessEvent(self))
+        for child in self._children:
+            child._mark_destroyed()
+        self._children = []
+        self._packed = []
+
+    def destroy(self):
+        self.backend.count("destroy")
+        if self.master is not None and self in self.master._children:
+            self.master._children.remove(self)
+            if self.manager == "pack":
+                self.master._packed.remove(self)
+        self._mark_destroyed()
+
+    # -- timers (run by the toplevel's virtual clock)
+    # As in tkinter, a callback scheduled through a widget is owned by it:
+    # once the widget is destroyed the callback no longer exists, and firing
+    # it is a background error ("invalid command name"), counted as bgerror.
+    def after(self, ms, func=None, *args):
+        root = self.winfo_toplevel()
+        job = root.after(ms, func, *args)
+        root._owners[job] = self
+        return job
+
+    def after_idle(self, func, *args):
+        root = self.winfo_toplevel()
+        job = root.after_idle(func, *args)
+        root._owners[job] = self
+        return job
+
+    def after_cancel(self, job_id):
+        return self.winfo_toplevel().after_cancel(job_id)
+
+    # -- events
+    def bind(self, sequence, func=None, add=None):
+        self.backend.count("bind")
+        handlers = self._bindings.setdefault(sequence, [])
+        if not add:
+            handlers.clear()
+        if func is not None:
+            handlers.append(func)
+        return f"bind{id(func)}"
+
+    def unbind(self, sequence, funcid=None):
+        self.backend.count("unbind")
+        self._bindings.pop(sequence, None)
+
+    def bind_all(self, sequence, func=None, add=None):
+        return self.winfo_toplevel()._bind_all(sequence, func, add)
+
+    def event_generate(self, sequence, **fields):
+        """Deliver a synthetic event to this widget's bindings, then to
+        the "all" bindings of its toplevel (the Tk bindtag order)."""
+        event = HeadlessEvent(self, **fields)
+        for handler in list(self._bindings.get(sequence, ())):
+            if handler(event) == "break":
+                return event
+        root = self.winfo_toplevel()
+        for handler in list(root._all_bindings.get(sequence, ())):
+            if handler(event) == "break":
+                break
+        return event
+
+    def invoke(self):
+        command = self.options.get("command")
+        if command:
+            return command()
+
+
+class HeadlessListbox(HeadlessWidget):
+    widget_class = "Listbox"
+
+    def __init__(self, master=None, backend=None, tag="ul", **options):
+        super().__init__(master, backend, tag, **options)
+        self.items = []
+
+    def _index(self, index):
+        if index == "end":
+            return len(self.items)
+        return int(index)
+
+    def insert(self, index, *elements):
+        self.backend.count("insert")
+        i = self._index(index)
+        self.items[i:i] = [str(e) for e in elements]
+
+    def delete(self, first, last=None):
+        self.backend.count("delete")
+        first = self._index(first)
+        last = first if last is None else self._index(last)
+        del self.items[first:last + 1]
+
+    def get(self, first, last=None):
+        self.backend.count("get")
+        first = self._index(first)
+        if last is None:
+            return self.items[first]
+        return tuple(self.items[first:self._index(last) + 1])
+
+    def size(self):
+        self.backend.count("size")
+        return len(self.items)
+
+
+class HeadlessCanvas(HeadlessWidget):
+    """Canvas with text and rectangle items; text is measured as 7x14 px
+    per character so hit-testing works without fonts."""
+
+    widget_class = "Canvas"
+
+    def __init__(self, master=None, backend=None, tag="canvas", **options):
+        super().__init__(master, backend, tag, **options)
+        self.items = {}  # id -> [type, coords, options]
+        self._ids = itertools.count(1)
+
+    def _create(self, kind, coords, options):
+        self.backend.count("create_" + kind)
+        item = next(self._ids)
+        self.items[item] = [kind, list(coords), dict(options)]
+        return item
+
+    def create_text(self, x, y, **options):
+        return self._create("text", (x, y), options)
+
+    def create_rectangle(self, x0, y0, x1, y1, **options):
+        return self._create("rectangle", (x0, y0, x1, y1), options)
+
+    def itemconfigure(self, item, **options):
+        self.backend.count("itemconfigure")
+        self.items[item][2].update(options)
+
+    itemconfig = itemconfigure
+
+    def itemcget(self, item, option):
+        self.backend.count("itemcget")
+        return self.items[item][2].get(option, "")
+
+    def coords(self, item, *coords):
+        self.backend.count("coords")
+        if not coords:
+            return list(self.items[item][1])
+        self.items[item][1] = list(coords)
+
+    def delete(self, *items):
+        self.backend.count("delete")
+        for item in items:
+            if item == "all":
+                self.items.clear()
+            else:
+                self.items.pop(item, None)
+
+    def bbox(self, item):
+        kind, coords, options = self.items[item]
+        if kind == "rectangle":
+            return tuple(coords)
+        x, y = coords
+        return (x, y, x + 7 * len(str(options.get("text", ""))), y + 14)
+
+    def find_overlapping(self, x0, y0, x1, y1):
+        self.backend.count("find_overlapping")
+        out = []
+        for item in self.items:
+            bx0, by0, bx1, by1 = self.bbox(item)
+            if bx0 <= x1 and x0 <= bx1 and by0 <= y1 and y0 <= by1:
+                out.append(item)
+        return tuple(out)
+
+    def canvasx(self, x):
+        return x
+
+    def canvasy(self, y):
+        return y
+
+    def click(self, x, y):
+        """Simulate a left click at canvas coordinates (x, y)."""
+        return self.event_generate("<Button-1>", x=x, y=y)
+
+
+class HeadlessTreeview(HeadlessWidget):
+    """Flat Treeview: top-level items with values, plus headings/columns."""
+
+    widget_class = "Treeview"
+
+    def __init__(self, master=None, backend=None, tag="table", **options):
+        super().__init__(master, backend, tag, **options)
+        self.rows = {}  # iid -> values, in insertion order
+        self.headings = {}
+        self.column_options = {}
+
+    def heading(self, column, **options):
+        self.backend.count("heading")
+        self.headings.setdefault(column, {}).update(options)
+
+    def column(self, column, **options):
+        self.backend.count("column")
+        self.column_options.setdefault(column, {}).update(options)
+
+    def insert(self, parent, index, iid=None, values=()):
+        self.backend.count("insert")
+        iid = iid if iid is not None else f"I{len(self.rows) + 1:03d}"
+        self.rows[iid] = tuple(values)
+        return iid
+
+    def item(self, iid, values=None):
+        self.backend.count("item")
+        if values is None:
+            return {"values": list(self.rows[iid])}
+        self.rows[iid] = tuple(values)
+
+    def delete(self, *iids):
+        self.backend.count("delete")
+        for iid in iids:
+            del self.rows[iid]
+
+    def get_children(self, item=""):
+        self.backend.count("get_children")
+        return tuple(self.rows)
+
+    def heading_click(self, column):
+        """Simulate a click on a column heading."""
+        command = self.headings.get(column, {}).get("command")
+        if command is not None:
+            command()
+
+
+class HeadlessText(HeadlessWidget):
+    """Text widget holding plain content and a `height`-line viewport."""
+
+    widget_class = "Text"
+
+    def __init__(self, master=None, backend=None, tag="log", **options):
+        super().__init__(master, backend, tag, **options)
+        self.content = "\n"  # Tk keeps a final newline
+        self.top = 0  # First visible line, 0-based
+
+    def _offset(self, index):
+        index = str(index)
+        if index.startswith("end"):
+            offset = len(self.content)
+            if index.endswith("-1c"):
+                offset -= 1
+            return offset
+        line, col = (int(p) for p in index.split("."))
+        offset = 0
+        for _ in range(line - 1):
+            nl = self.content.find("\n", offset)
+            if nl < 0:
+                return len(self.content)
+            offset = nl + 1
+        return offset + col
+
+    def _line_count(self):
+        return max(1, self.content.count("\n"))
+
+    def insert(self, index, chars):
+        self.backend.count("insert")
+        if self.options.get("state") == "disabled":
+            return
+        i = min(self._offset(index), len(self.content) - 1)
+        self.content = self.content[:i] + chars + self.content[i:]
+
+    def delete(self, first, last=None):
+        self.backend.count("delete")
+        if self.options.get("state") == "disabled":
+            return
+        a = self._offset(first)
+        b = a + 1 if last is None else self._offset(last)
+        self.content = self.content[:a] + self.content[b:]
+        if not self.content.endswith("\n"):
+            self.content += "\n"
+        self.top = min(self.top, self._line_count() - 1)
+
+    def get(self, first, last=None):
+        self.backend.count("get")
+        a = self._offset(first)
+        b = a + 1 if last is None else self._offset(last)
+        return self.content[a:b]
+
+    def yview(self, *args):
+        self.backend.count("yview")
+        total = self._line_count()
+        height = self.options.get("height", 24)
+        return (self.top / total, min(1.0, (self.top + height) / total))
+
+    def yview_scroll(self, number, what="units"):
+        self.backend.count("yview")
+        height = self.options.get("height", 24)
+        self.top = max(0, min(self.top + number, self._line_count() - height))
+
+    def see(self, index):
+        self.backend.count("see")
+        line = self.content[:self._offset(index)].count("\n")
+        height = self.options.get("height", 24)
+        if line >= self.top + height:
+            self.top = line - height + 1
+        elif line < self.top:
+            self.top = line
+
+
+class HeadlessEntry(HeadlessWidget):
+    widget_class = "TEntry"
+
+    def __init__(self, master=None, backend=None, tag="input", **options):
+        super().__init__(master, backend, tag, **options)
+        self._text = ""
+        self.cursor = 0
+
+    @property
+    def text(self):
+        # With a textvariable the variable holds the content, as in Tk
+        var = self.options.get("textvariable")
+        return self._text if var is None else var.value
+
+    @text.setter
+    def text(self, value):
+        var = self.options.get("textvariable")
+        if var is None:
+            self._text = value
+        else:
+            var.value = value
+
+    def _index(self, index):
+        if index == "end":
+            return len(self.text)
+        if index == "insert":
+            return min(self.cursor, len(self.text))
+        return int(index)
+
+    def get(self):
+        self.backend.count("get")
+        return self.text
+
+    def insert(self, index, string):
+        self.backend.count("insert")
+        i = self._index(index)
+        self.text = self.text[:i] + string + self.text[i:]
+        if self.cursor >= i:
+            self.cursor += len(string)
+
+    def delete(self, first, last=None):
+        self.backend.count("delete")
+        first = self._index(first)
+        last = first + 1 if last is None else self._index(last)
+        self.text = self.text[:first] + self.text[last:]
+        self.cursor = min(self.cursor, len(self.text))
+
+    def index(self, index):
+        self.backend.count("index")
+        return self._index(index)
+
+    def icursor(self, index):
+        self.backend.count("icursor")
+        self.cursor = self._index(index)
+
+    def type(self, text):
+        """Simulate typing `text` at the cursor, firing <KeyRelease> per key."""
+        for ch in text:
+            i = self.cursor
+            self.text = self.text[:i] + ch + self.text[i:]
+            self.cursor += 1
+            self.event_generate("<KeyRelease>", char=ch, keysym=ch)
+
+
+class HeadlessStringVar:
+    """tk.StringVar stand-in; an entry configured with it shares its value."""
+
+    def __init__(self, master=None, value=""):
+        self.backend = master.backend
+        self.value = value
+
+    def get(self):
+        self.backend.count("var_get")
+        return self.value
+
+    def set(self, value):
+        self.backend.count("var_set")
+        self.value = value
+
+
+class HeadlessImage:
+    def __init__(self, name, options):
+        self.name = name
+        self.options = dict(options)
+
+    def __str__(self):
+        return self.name
+
+
+class HeadlessRoot(HeadlessWidget):
+    """Toplevel with a virtual clock driving after/after_idle callbacks."""
+
+    widget_class = "Tk"
+
+    def __init__(self, backend):
+        super().__init__(None, backend, "root")
+        self.now = 0
+        self._timers = []
+        self._idle = []
+        self._cancelled = set()
+        self._queued = set()
+        self._owners = {}  # job -> widget that scheduled it
+        self._all_bindings = {}
+        self._ids = itertools.count(1)
+
+    def _bind_all(self, sequence, func, add):
+        self.backend.count("bind_all")
+        handlers = self._all_bindings.setdefault(sequence, [])
+        if not add:
+            handlers.clear()
+        if func is not None:
+            handlers.append(func)
+        return f"bind{id(func)}"
+
+    def after(self, ms, func=None, *args):
+        self.backend.count("after")
+        job = f"after#{next(self._ids)}"
+        self._queued.add(job)
+        heapq.heappush(self._timers, (self.now + int(ms), job, func, args))
+        return job
+
+    def after_idle(self, func, *args):
+        self.backend.count("after_idle")
+        job = f"idle#{next(self._ids)}"
+        self._queued.add(job)
+        self._idle.append((job, func, args))
+        return job
+
+    def after_cancel(self, job):
+        self.backend.count("after_cancel")
+        if job in self._queued:
+            self._cancelled.add(job)
+
+    def _run(self, job, func, args):
+        self._queued.discard(job)
+        owner = self._owners.pop(job, None)
+        if job in self._cancelled:
+            self._cancelled.discard(job)
+            return
+        if owner is not None and not owner._exists:
+            self.backend.count("bgerror")
+            return
+        func(*args)
+
+    def update_idletasks(self):
+        while self._idle:
+            batch, self._idle = self._idle, []
+            for job, func, args in batch:
+                self._run(job, func, args)
+
+    def update(self):
+        """Run idle callbacks and every timer that is due at `now`."""
+        self.update_idletasks()
+        while self._timers and self._timers[0][0] <= self.now:
+            _, job, func, args = heapq.heappop(self._timers)
+            self._run(job, func, args)
+            self.update_idletasks()
+
+    def advance(self, ms):
+        """Move the virtual clock forward, firing timers in order."""
+        target = self.now + ms
+        self.update()
+        while self._timers and self._timers[0][0] <= target:
+            self.now = self._timers[0][0]
+            self.update()
+        self.now = target
+        self.update()
+
+    def pending(self):
+        jobs = [job for job, _, _ in self._idle]
+        jobs += [job for _, job, _, _ in self._timers]
+        return sum(1 for job in jobs if job not in self._cancelled)
+
+    def mainloop(self):
+        while self._idle or self._timers:
+            if self._timers and not self._idle:
+                self.now = max(self.now, self._timers[0][0])
+            self.update()
+
+
+class HeadlessBackend:
+    """Host backend whose widgets live in Python memory and count operations."""
+
+    name = "headless"
+
+    def __init__(self):
+        self.ops = Counter()
+        self.tag_map = {
+            "ul": HeadlessListbox,
+            "input": HeadlessEntry,
+            "canvas": HeadlessCanvas,
+            "table": HeadlessTreeview,
+            "log": HeadlessText,
+        }
+
+    def count(self, op):
+        self.ops[op] += 1
+
+    def reset(self):
+        self.ops.clear()
+
+    def total(self):
+        return sum(self.ops.values())
+
+    def root(self):
+        return HeadlessRoot(self)
+
+    def create(self, tag, parent, **options):
+        cls = self.tag_map.get(tag, HeadlessWidget)
+        return cls(parent, self, tag, **options)
+
+    def is_list(self, w):
+        return isinstance(w, HeadlessListbox)
+
+    def is_entry(self, w):
+        return isinstance(w, HeadlessEntry)
+
+    def is_canvas(self, w):
+        return isinstance(w, HeadlessCanvas)
+
+    def is_table(self, w):
+        return isinstance(w, HeadlessTreeview)
+
+    def is_log(self, w):
+        return isinstance(w, HeadlessText)
+
+    def string_var(self, widget):
+        return HeadlessStringVar(widget)
+
+    def named_font(self, root, name, spec):
+        self.count("font")
+        return name
+
+    def photo_image(self, root, name, options):
+        self.count("image")
+        return HeadlessImage(name, options)
+
+    def delete_image(self, image):
+        self.count("image_delete")
+
+    def configure_style(self, root, name, options):
+        self.count("style")
+
+    def pack_many(self, widgets, **options):
+        self.count("pack")
+        for w in widgets:
+            if not w._exists:
+                raise RuntimeError(f"bad window path name {w!r}")
+        for w in widgets:
+            w._manage("pack", dict(options), count=False)
+
+    def forget_many(self, manager, widgets):
+        self.count(manager + "_forget")
+        gone = set(widgets)
+        if manager == "pack":
+            for master in {w.master for w in widgets if w.master is not None}:
+                master._packed = [w for w in master._packed if w not in gone]
+        for w in widgets:
+            if w.manager == manager:
+                w.manager = None
+                w.layout = {}
+
+    def detach(self, widgets):
+        gone = set(widgets)
+        for master in {w.master for w in widgets if w.master is not None}:
+            master._children = [w for w in master._children if w not in gone]
+
+    def count_widgets(self, widgets):
+        # Python-side bookkeeping in tkinter too, so not an operation
+        return sum(widget_count(w) for w in widgets)
+
+    def destroy_many(self, widgets):
+        self.count("destroy")
+        for w in widgets:
+            if w._exists:
+                w._mark_destroyed()
+
+
+def widget_count(widget):
+    """Number of live widgets below (and including) `widget`."""
+    return 1 + sum(widget_count(c) for c in widget._children)
@@ -0,0 +1,99 @@
+# list_view.py - Filterable item list, imported when the List tab first mounts
+
+import rtk
+from vdom import h
+from memo import create_lru_memo, memo_key_from
+from filtering import FilteredCollection
+from persistent import PVector
+
+FILTER_DEBOUNCE_MS = 120
+
+
+# -------------------------
+# List View Component (visibility removed)
+# -------------------------
+def ListView(parent_container):
+    """List view component - no longer handles visibility"""
+    state = {
+        "items": PVector(),
+        "filter": "",
+        "parent_tick": 0
+    }
+
+    # Items are append-only, so (count, filter) identifies a result and
+    # switching back to an earlier filter string is a cache hit.
+    memo_filtered = create_lru_memo(maxsize=16)
+    filtered = FilteredCollection()
+
+    def get_filtered():
+        items = state["items"]
+        filt = state["filter"]
+
+        def compute():
+            filtered.set_query(filt)
+            return filtered.results()
+
+        return memo_filtered(compute, [len(items), filt])
+
+    def on_filter(e):
+        val = e.widget.get()
+        if state["filter"] != val:
+            state["filter"] = val
+            lifecycle['events'].append({"type": "filter_changed", "filter": val})
+            # The Entry edits itself; re-filter once typing pauses
+            lifecycle['scheduler'].request("high", debounce=FILTER_DEBOUNCE_MS)
+
+    def on_add():
+        new_item = f"Item {len(state['items']) + 1} @t{state['parent_tick']}"
+        state["items"] = state["items"].append(new_item)
+        filtered.append(new_item)
+        lifecycle['events'].append({
+            "type": "item_added",
+            "item": new_item,
+            "count": len(state["items"]),
+        })
+        lifecycle['scheduler'].request("high")
+
+    def render():
+        mk = memo_key_from(["list", state["filter"], state["items"]])
+        filtered_items = get_filtered()
+        return h("div", {"class": "view list"}, [
+            h("div", {"class": "list-controls"}, [
+                h("input", {
+                    "value": state["filter"],
+                    "on_input": on_filter,
+                    "layout": {"pack": {"side": "left", "fill": "x", "expand": True}},
+                }),
+                h("button", {
+                    "text": "Add",
+                    "command": on_add,
+                    "layout": {"pack": {"side": "left"}},
+                }),
+            ]),
+            # The collection's delta lets the Listbox apply only the rows
+            # that changed since the last result
+            h("ul", {"items": filtered_items, "delta": filtered.delta},
+              memo_key=mk),
+        ], memo_key=mk)
+
+    def process_message(msg, state, update, scheduler, events):
+        updated = False
+        
+        if "parent_tick" in msg and state["parent_tick"] != msg["parent_tick"]:
+            state["parent_tick"] = msg["parent_tick"]
+            updated = True
+        
+        if updated:
+            scheduler.request()
+
+    lifecycle = rtk.component_lifecycle(parent_container, render, parent_container, state, process_message)
+
+    try:
+        lifecycle['update']()
+        parent_msg = yield lifecycle['flush_events']()
+        while True:
+            if parent_msg and isinstance(parent_msg, dict):
+                lifecycle['process_message'](parent_msg)
+            parent_msg = yield lifecycle['flush_events']()
+    finally:
+        lifecycle['cleanup']()
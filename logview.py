@@ -0,0 +1,242 @@
+# logview.py - Streaming `log` element on tk.Text
+#
+#   stream = LogStream(max_lines=5000)
+#   h("log", {"stream": stream, "height": 20, "wrap": "none"})
+#
+#   stream.write("partial line... ")     # any thread
+#   stream.extend(["line 1", "line 2"])
+#   stream.follow(tail_lines(path))      # non-blocking, pulled per frame
+#
+# Producers only append to the stream. Once per frame the element drains it
+# into the Text widget: one `insert` for everything that arrived, one
+# `delete` from the top when more than max_lines are retained, and `see end`
+# only if the view was already at the bottom (so scrolling back to read
+# stops auto-scroll). Lines that would be trimmed before they are ever shown
+# are dropped in Python, so a burst costs at most max_lines of text.
+#
+# Frames are only scheduled while there is something to drain: the stream
+# wakes its element when lines arrive or a source is followed, and an idle
+# log holds no timer. A wake-up from another thread is an `after` call,
+# which tkinter runs on the Tk thread; the element's lock makes sure only
+# one frame is queued, and is never held across a Tk call. The pending
+# frame is cancelled when the element is destroyed.
+import threading
+from collections import deque
+
+from vdom import is_discarded
+
+FRAME_MS = 16
+# Lines pulled from followed generators per frame (~60k lines/s at 60 fps)
+FOLLOW_BUDGET = 1000
+
+
+class LogStream:
+    """Append-only line buffer between producers and a `log` element."""
+
+    def __init__(self, max_lines=10_000):
+        self.max_lines = max_lines
+        self.pending = deque(maxlen=max_lines)
+        self.partial = ""
+        self.sources = []
+        self.listeners = []  # Called when there is something to drain
+        self.received = 0  # Lines accepted so far
+        self.dropped = 0  # Lines trimmed before they were shown
+        self._lock = threading.Lock()
+
+    def write(self, chunk):
+        """Append text; a trailing partial line waits for its newline."""
+        with self._lock:
+            parts = (self.partial + chunk).split("\n")
+            self.partial = parts.pop()
+            self._append(parts)
+        if parts:
+            self._notify()
+
+    def extend(self, lines):
+        lines = list(lines)
+        with self._lock:
+            self._append(lines)
+        if lines:
+            self._notify()
+
+    def append(self, line):
+        self.extend((line,))
+
+    def _append(self, lines):
+        overflow = len(self.pending) + len(lines) - self.max_lines
+        if overflow > 0:
+            self.dropped += overflow
+        self.pending.extend(lines)
+        self.received += len(lines)
+
+    def follow(self, iterable):
+        """Pull lines (or chunks ending in newlines) from `iterable` each
+        frame. It must not block; yield "" when nothing is available."""
+        self.sources.append(iter(iterable))
+        self._notify()
+
+    def busy(self):
+        """Whether a frame would have anything to do."""
+        return bool(self.pending or self.sources)
+
+    def _notify(self):
+        for listener in list(self.listeners):
+            listener()
+
+    def poll(self, budget=FOLLOW_BUDGET):
+        for source in list(self.sources):
+            while budget > 0:
+                try:
+                    item = next(source)
+                except StopIteration:
+                    self.sources.remove(source)
+                    break
+                if not item:
+                    break
+                if "\n" in item:
+                    self.write(item)
+                else:
+                    self.append(item)
+                budget -= 1
+
+    def take(self):
+        """Remove and return everything pending."""
+        with self._lock:
+            lines = list(self.pending)
+            self.pending.clear()
+        return lines
+
+
+# -------------------------
+# Element
+# -------------------------
+def mount(text, props):
+    state = {
+        "stream": None, "max_lines": 10_000, "lines": 0,
+        # Frame scheduling, shared with producer threads under "lock":
+        # "token" is set while a frame is queued, "job" is its after id
+        # once known, "closed" stops scheduling for good.
+        "lock": threading.Lock(), "token": None, "job": None, "closed": False,
+    }
+    state["wake"] = lambda: _schedule(text, state)
+    setattr(text, "_log", state)
+    try:
+        text.configure(state="disabled")
+    except Exception:
+        pass
+    text.bind("<Destroy>", lambda e: _on_destroy(text, state, e), add="+")
+    patch(text, {}, props)
+
+
+def patch(text, old_props, props):
+    state = text._log
+    stream = props.get("stream")
+    if stream is not state["stream"]:
+        if state["stream"] is not None:
+            state["stream"].listeners.remove(state["wake"])
+            _clear(text, state)
+        state["stream"] = stream
+        if stream is not None:
+            stream.listeners.append(state["wake"])
+            if stream.busy():
+                _schedule(text, state)
+    max_lines = props.get("max_lines")
+    if max_lines is None:
+        max_lines = stream.max_lines if stream is not None else 10_000
+    if max_lines != state["max_lines"]:
+        state["max_lines"] = max_lines
+        if state["lines"] > max_lines:
+            _write(text, state, [])
+
+
+def _schedule(text, state):
+    """Queue a frame unless one is queued already; safe from any thread."""
+    token = object()
+    with state["lock"]:
+        if state["token"] is not None or state["closed"]:
+            return
+        state["token"] = token
+    job = text.after(FRAME_MS, lambda: _frame(text, state))
+    with state["lock"]:
+        if state["token"] is token:
+            state["job"] = job
+        cancel = state["closed"]
+    if cancel:  # Destroyed while the frame was being queued
+        try:
+            text.after_cancel(job)
+        except Exception:
+            pass
+
+
+def _frame(text, state):
+    with state["lock"]:
+        state["token"] = state["job"] = None
+    try:
+        if not text.winfo_exists():
+            return
+        if is_discarded(text):
+            _close(text, state)
+            return
+    except Exception:
+        return
+    stream = state["stream"]
+    if stream is None:
+        return
+    if stream.sources:
+        stream.poll()
+    lines = stream.take()
+    if lines:
+        _write(text, state, lines)
+    if stream.busy():
+        _schedule(text, state)
+
+
+def _close(text, state):
+    """Stop scheduling frames and cancel the queued one, if any."""
+    with state["lock"]:
+        state["closed"] = True
+        job, state["job"], state["token"] = state["job"], None, None
+    if job is not None:
+        try:
+            text.after_cancel(job)
+        except Exception:
+            pass
+    if state["stream"] is not None:
+        state["stream"].listeners.remove(state["wake"])
+        state["stream"] = None
+
+
+def _on_destroy(text, state, event):
+    if event.widget is text:
+        _close(text, state)
+
+
+def _write(text, state, lines):
+    max_lines = state["max_lines"]
+    if len(lines) > max_lines:
+        lines = lines[-max_lines:]
+    # Pinned when the last line is visible; checked before inserting
+    pinned = text.yview()[1] >= 1.0
+    text.configure(state="normal")
+    if lines:
+        text.insert("end-1c", "\n".join(lines) + "\n")
+    total = state["lines"] + len(lines)
+    if total > max_lines:
+        text.delete("1.0", f"{total - max_lines + 1}.0")
+        total = max_lines
+    text.configure(state="disabled")
+    state["lines"] = total
+    if pinned:
+        text.see("end")
+
+
+def _clear(text, state):
+    text.configure(state="normal")
+    text.delete("1.0", "end")
+    text.configure(state="disabled")
+    state["lines"] = 0
+
+
+def line_count(text):
+    """Lines currently retained by a mounted `log` element."""
+    return text._log["lines"]
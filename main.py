@@ -1,22 +1,54 @@
 # main.py
-import tkinter as tk
-from tkinter import ttk
+import os
+
+from startup import StartupTimer
+
+# RTK_STARTUP=1 python main.py  -> import/tk/theme/render/paint/interactive ms
+timer = StartupTimer(
+    report=("paint", "interactive") if os.environ.get("RTK_STARTUP") else ()
+)
+
+import tkinter as tk  # noqa: E402
+from tkinter import ttk  # noqa: E402
+
+from theme import PALETTES, use_theme  # noqa: E402
+from multi_view_with_portal import MultiViewWithPortal  # noqa: E402
+from runner import run_component  # noqa: E402
+
+
+def cycle_theme(root):
+    names = list(PALETTES)
+    current = getattr(root, "_theme", names[0])
+    use_theme(root, names[(names.index(current) + 1) % len(names)])
 
-from theme import create_two_color_theme, apply_focus_bigger, BASE_FONT
-from multi_view_with_portal import MultiViewWithPortal
-from runner import run_component
 
 def main():
+    timer.mark("import")
     root = tk.Tk()
     root.title("Multi-View + Portal (Tk generator + Themed)")
+    timer.mark("tk")
 
-    try:
-        root.option_add("*Font", BASE_FONT)
-    except Exception:
-        root.option_add("*Font", ("Courier New", 12))
+    # RTK_TCL_PROFILE=out.folded python main.py  -> Tcl round-trip profile
+    profiler = None
+    profile_path = os.environ.get("RTK_TCL_PROFILE")
+    if profile_path:
+        from tclprof import TclProfiler
+        profiler = TclProfiler(root)
+        profiler.install()
 
-    style = create_two_color_theme(root)
-    apply_focus_bigger(style, root)
+    # RTK_THEME=dark python main.py; Ctrl+T cycles the variants
+    use_theme(root, os.environ.get("RTK_THEME", "light"))
+    root.bind("<Control-t>", lambda e: cycle_theme(root))
+    timer.mark("theme")
+    timer.on_first_paint(root)
+
+    # RTK_RECORD=session.rtk python main.py  -> trace for replay.py
+    recorder = None
+    record_path = os.environ.get("RTK_RECORD")
+    if record_path:
+        from replay import Recorder
+        recorder = Recorder(record_path)
+        recorder.install()
 
     app_frame = ttk.Frame(root, padding=24)
     app_frame.pack(fill="both", expand=True)
@@ -26,6 +58,9 @@ def main():
 
     gen = MultiViewWithPortal({"title": "Multi-View + Portal"}, app_frame, external)
     app = run_component(gen)
+    timer.mark("render")
+    if recorder:
+        recorder.attach(app)
 
     tick = 0
     # fps = 144
@@ -35,17 +70,30 @@ def main():
     global pump
     def pump():
         nonlocal tick
+        if profiler:
+            profiler.next_frame()
         evs = app.get_events()
         if evs:
             print("Events:", evs)
         tick += 1
         app.send({"tick": tick//fps})
+        timer.mark("interactive")
         root.after(1000//fps, pump)
         # root.after(5000, pump)
 
-    root.after(1000, pump)
+    # Child events (tab clicks) reach the coordinator through pumps, so the
+    # first one runs as soon as the first frame is up rather than after 1 s.
+    # It also starts the deferred components.
+    root.after_idle(pump)
     root.minsize(560, 380)
     root.mainloop()
 
+    if recorder:
+        recorder.uninstall()
+    if profiler:
+        profiler.uninstall()
+        profiler.report()
+        profiler.dump_folded(profile_path)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,4 +1,7 @@
 # memo.py
+from collections import OrderedDict
+
+
 def shallow_equal(a, b):
     if a is b:
         return True
@@ -21,5 +24,131 @@ def create_memo():
 
     return compute
 
+def create_lru_memo(maxsize=128, key=None, weight=None, max_weight=None):
+    """Like create_memo, but remembers up to `maxsize` results keyed by deps.
+
+    Args:
+        maxsize: maximum number of cached results (None for unbounded)
+        key: maps the deps sequence to a hashable cache key
+            (default: tuple(deps))
+        weight: optional fn(value) -> number used for the size budget
+        max_weight: evict least recently used results while the summed
+            weight of the cache exceeds this budget (requires `weight`)
+
+    The returned compute(fn, deps) also exposes stats() and clear().
+    Unhashable deps are never cached; they count as a miss.
+    """
+    if max_weight is not None and weight is None:
+        raise ValueError("max_weight needs a weight function")
+    cache = OrderedDict()
+    weights = {}
+    total_weight = 0
+    hits = misses = evictions = 0
+
+    def evict_one():
+        nonlocal total_weight, evictions
+        old_key, _ = cache.popitem(last=False)
+        total_weight -= weights.pop(old_key, 0)
+        evictions += 1
+
+    def compute(fn, deps):
+        nonlocal total_weight, hits, misses
+        k = key(deps) if key is not None else tuple(deps)
+        try:
+            val = cache[k]
+        except KeyError:
+            pass
+        except TypeError:
+            misses += 1
+            return fn()
+        else:
+            hits += 1
+            cache.move_to_end(k)
+            return val
+
+        misses += 1
+        val = fn()
+
+        w = 0
+        if weight is not None:
+            w = weight(val)
+            if max_weight is not None and w > max_weight:
+                return val  # Would evict everything else; don't cache it
+            weights[k] = w
+            total_weight += w
+
+        cache[k] = val
+        while maxsize is not None and len(cache) > maxsize:
+            evict_one()
+        while max_weight is not None and total_weight > max_weight:
+            evict_one()
+        return val
+
+    def stats():
+        return {
+            "hits": hits,
+            "misses": misses,
+            "evictions": evictions,
+            "size": len(cache),
+            "weight": total_weight,
+        }
+
+    def clear():
+        nonlocal total_weight
+        cache.clear()
+        weights.clear()
+        total_weight = 0
+
+    compute.stats = stats
+    compute.clear = clear
+    return compute
+
+# Types whose instances can be compared by value without risk of in-place
+# mutation. Everything else is compared by identity.
+_VALUE_TYPES = (str, int, float, complex, bool, bytes, type(None))
+
+
+class MemoKey:
+    """Memo key built from a tuple of deps.
+
+    Immutable scalars are compared by value; any other dep (lists, dicts,
+    state objects) is compared by identity, so callers should replace rather
+    than mutate a dep when it changes. The hash is computed once and the
+    deps are held so identities cannot be recycled while the key is alive.
+    """
+
+    __slots__ = ("deps", "_hash")
+
+    def __init__(self, deps):
+        self.deps = tuple(deps)
+        self._hash = hash(tuple(
+            d if isinstance(d, _VALUE_TYPES) else id(d) for d in self.deps
+        ))
+
+    def __hash__(self):
+        return self._hash
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, MemoKey) or self._hash != other._hash:
+            return False
+        if len(self.deps) != len(other.deps):
+            return False
+        for a, b in zip(self.deps, other.deps):
+            if a is b:
+                continue
+            if (
+                type(a) is not type(b)
+                or not isinstance(a, _VALUE_TYPES)
+                or a != b
+            ):
+                return False
+        return True
+
+    def __repr__(self):
+        return f"MemoKey({self.deps!r})"
+
+
 def memo_key_from(deps):
-    return "|".join(str(d) for d in deps)
\ No newline at end of file
+    return MemoKey(deps)
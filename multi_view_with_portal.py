@@ -4,6 +4,10 @@ import rtk
 from vdom import h, Portal, Component
 from memo import create_memo, memo_key_from
 
+# Not shown at startup: its module (and the filtering/persistent modules it
+# needs) is imported when the List tab is first opened.
+ListView = rtk.lazy_component("list_view", "ListView")
+
 
 # -------------------------
 # Tab Navigation Component (unchanged)
@@ -97,81 +101,13 @@ def CounterView(parent_container):
         lifecycle['cleanup']()
 
 
-# -------------------------
-# List View Component (visibility removed)
-# -------------------------
-def ListView(parent_container):
-    """List view component - no longer handles visibility"""
-    state = {
-        "items": [],
-        "filter": "",
-        "parent_tick": 0
-    }
-
-    memo_filtered = create_memo()
-
-    def get_filtered():
-        items = tuple(state["items"])
-        filt = state["filter"]
-        return memo_filtered(
-            lambda: [x for x in items if filt.lower() in x.lower()],
-            [items, filt]
-        )
-
-    def on_filter(e):
-        val = e.widget.get()
-        if state["filter"] != val:
-            state["filter"] = val
-            lifecycle['events'].append({"type": "filter_changed", "filter": val})
-            lifecycle['scheduler'].request("high")
-
-    def on_add():
-        new_item = f"Item {len(state['items']) + 1} @t{state['parent_tick']}"
-        state["items"] = state["items"] + [new_item]
-        lifecycle['events'].append({"type": "item_added", "items": state["items"]})
-        lifecycle['scheduler'].request("high")
-
-    def render():
-        mk = memo_key_from(["list", state["filter"], len(state["items"])])
-        filtered_items = get_filtered()
-        return h("div", {"class": "view list"}, [
-            h("div", {"class": "list-controls"}, [
-                h("input", {"value": state["filter"], "on_input": on_filter}),
-                h("button", {"text": "Add", "command": on_add}),
-            ]),
-            h("ul", {}, filtered_items, memo_key=mk),
-        ], memo_key=mk)
-
-    def process_message(msg, state, update, scheduler, events):
-        updated = False
-        
-        if "parent_tick" in msg and state["parent_tick"] != msg["parent_tick"]:
-            state["parent_tick"] = msg["parent_tick"]
-            updated = True
-        
-        if updated:
-            scheduler.request()
-
-    lifecycle = rtk.component_lifecycle(parent_container, render, parent_container, state, process_message)
-
-    try:
-        lifecycle['update']()
-        parent_msg = yield lifecycle['flush_events']()
-        while True:
-            if parent_msg and isinstance(parent_msg, dict):
-                lifecycle['process_message'](parent_msg)
-            parent_msg = yield lifecycle['flush_events']()
-    finally:
-        lifecycle['cleanup']()
-
-
 # -------------------------
 # Status Bar Component (unchanged)
 # -------------------------
 def StatusBar(parent_container, portal_host):
     """Status bar component - listens to sibling events"""
-    host = rtk.create_host(parent_container)
-    host.pack_forget()
+    # Renders only a portal, which needs no widget of its own here
+    host = parent_container
 
     state = {
         "active": "counter",
@@ -219,7 +155,7 @@ def StatusBar(parent_container, portal_host):
                         state["counter_count"] = event["count"]
                         lifecycle['scheduler'].request()
                 elif event.get("type") == "item_added":
-                    new_count = len(event["items"])
+                    new_count = event["count"]
                     if state["items_count"] != new_count:
                         state["items_count"] = new_count
                         lifecycle['scheduler'].request()
@@ -289,15 +225,18 @@ def MultiViewWithPortal(args, host, portal_host):
         """Conditionally render components based on active state"""
         # Filter children to remove None values
         views_children = list(filter(None, [
-            Component(CounterView, key="counter") if state["active"] == "counter" else None,
-            Component(ListView, key="list") if state["active"] == "list" else None,
+            Component(CounterView, key="counter", tag="div") if state["active"] == "counter" else None,
+            Component(ListView, key="list", tag="div") if state["active"] == "list" else None,
         ]))
         
         return h("div", {"class": "app"}, [
-            Component(Header, key="header"),
-            Component(TabNavigation, key="tabs"),
+            Component(Header, key="header", tag="h2"),
+            Component(TabNavigation, key="tabs", tag="div"),
             h("div", {"class": "views"}, views_children),
-            Component(lambda parent: StatusBar(parent, portal_host), key="status"),
+            Component(
+                lambda parent: StatusBar(parent, portal_host),
+                key="status", defer=True,
+            ),
         ])
 
     def handle_tab_changed(event):
@@ -344,8 +283,9 @@ def MultiViewWithPortal(args, host, portal_host):
     try:
         lifecycle['update']()
         
-        # Initial component initialization after first render
-        rtk.init_components_from_host(host, components)
+        # Initialize what the first frame shows; deferred components (the
+        # status bar) start with the first message, after first paint
+        rtk.init_components_from_host(host, components, deferred=False)
         if components:
             rtk.send_to_all_components(components, state)
         
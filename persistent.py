@@ -0,0 +1,405 @@
+# persistent.py - Structurally shared immutable collections for component state
+#
+# PVector is a 32-way bit-partitioned trie with a tail buffer (the Clojure
+# vector layout) and PMap is a hash array mapped trie. Every "update" returns
+# a new collection that shares all untouched nodes with the old one, so an
+# append or set copies O(log32 n) small nodes instead of the whole list, and
+# `old is not new` stays a valid change check for memo keys and selectors.
+
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+
+class PVector:
+    """Immutable sequence with O(log32 n) append, set and lookup."""
+
+    __slots__ = ("_count", "_shift", "_root", "_tail", "_hash")
+
+    def __init__(self, items=()):
+        self._count = 0
+        self._shift = BITS
+        self._root = []
+        self._tail = []
+        self._hash = None
+        if items:
+            filled = self.extend(items)
+            self._count = filled._count
+            self._shift = filled._shift
+            self._root = filled._root
+            self._tail = filled._tail
+
+    @classmethod
+    def _make(cls, count, shift, root, tail):
+        vec = cls.__new__(cls)
+        vec._count = count
+        vec._shift = shift
+        vec._root = root
+        vec._tail = tail
+        vec._hash = None
+        return vec
+
+    def __len__(self):
+        return self._count
+
+    def _tail_offset(self):
+        if self._count < WIDTH:
+            return 0
+        return ((self._count - 1) >> BITS) << BITS
+
+    def _leaf_for(self, i):
+        if i >= self._tail_offset():
+            return self._tail
+        node = self._root
+        for level in range(self._shift, 0, -BITS):
+            node = node[(i >> level) & MASK]
+        return node
+
+    def _index(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("PVector index out of range")
+        return i
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        i = self._index(i)
+        return self._leaf_for(i)[i & MASK]
+
+    def __iter__(self):
+        tail_offset = self._tail_offset()
+        for start in range(0, tail_offset, WIDTH):
+            yield from self._leaf_for(start)
+        yield from self._tail
+
+    def __reversed__(self):
+        for i in range(self._count - 1, -1, -1):
+            yield self[i]
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if isinstance(other, PVector):
+            return self._count == other._count and all(
+                a == b for a, b in zip(self, other)
+            )
+        if isinstance(other, (list, tuple)):
+            return self._count == len(other) and all(
+                a == b for a, b in zip(self, other)
+            )
+        return NotImplemented
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(tuple(self))
+        return self._hash
+
+    def __repr__(self):
+        return f"PVector({list(self)!r})"
+
+    def _push_tail(self, level, parent, tail_node):
+        node = list(parent)
+        sub = ((self._count - 1) >> level) & MASK
+        if level == BITS:
+            insert = tail_node
+        elif sub < len(parent):
+            insert = self._push_tail(level - BITS, parent[sub], tail_node)
+        else:
+            insert = _new_path(level - BITS, tail_node)
+        if sub < len(node):
+            node[sub] = insert
+        else:
+            node.append(insert)
+        return node
+
+    def append(self, value):
+        """Return a new vector with `value` added at the end."""
+        count = self._count
+        if count - self._tail_offset() < WIDTH:
+            return PVector._make(
+                count + 1, self._shift, self._root, self._tail + [value]
+            )
+
+        tail_node = self._tail
+        shift = self._shift
+        if (count >> BITS) > (1 << shift):
+            root = [self._root, _new_path(shift, tail_node)]
+            shift += BITS
+        else:
+            root = self._push_tail(shift, self._root, tail_node)
+        return PVector._make(count + 1, shift, root, [value])
+
+    def extend(self, values):
+        vec = self
+        for value in values:
+            vec = vec.append(value)
+        return vec
+
+    def set(self, i, value):
+        """Return a new vector with position `i` replaced by `value`."""
+        i = self._index(i)
+        if i >= self._tail_offset():
+            tail = list(self._tail)
+            tail[i & MASK] = value
+            return PVector._make(self._count, self._shift, self._root, tail)
+        return PVector._make(
+            self._count,
+            self._shift,
+            _assoc_path(self._shift, self._root, i, value),
+            self._tail,
+        )
+
+    def tolist(self):
+        return list(self)
+
+
+def _new_path(level, node):
+    while level > 0:
+        node = [node]
+        level -= BITS
+    return node
+
+
+def _assoc_path(level, node, i, value):
+    node = list(node)
+    if level == 0:
+        node[i & MASK] = value
+    else:
+        sub = (i >> level) & MASK
+        node[sub] = _assoc_path(level - BITS, node[sub], i, value)
+    return node
+
+
+# -------------------------
+# PMap (HAMT)
+# -------------------------
+_HASH_BITS = 64
+_MISSING = object()
+
+
+class _Node:
+    __slots__ = ("bitmap", "entries")
+
+    def __init__(self, bitmap, entries):
+        self.bitmap = bitmap
+        # Each entry is a (key, value) tuple, a _Node or a _Collision
+        self.entries = entries
+
+
+class _Collision:
+    __slots__ = ("hash", "pairs")
+
+    def __init__(self, h, pairs):
+        self.hash = h
+        self.pairs = pairs
+
+
+def _hash(key):
+    return hash(key) & ((1 << _HASH_BITS) - 1)
+
+
+def _pair_node(shift, h1, pair1, h2, pair2):
+    if shift >= _HASH_BITS:
+        return _Collision(h1, [pair1, pair2])
+    b1 = (h1 >> shift) & MASK
+    b2 = (h2 >> shift) & MASK
+    if b1 == b2:
+        return _Node(1 << b1, [_pair_node(shift + BITS, h1, pair1, h2, pair2)])
+    if b1 < b2:
+        return _Node((1 << b1) | (1 << b2), [pair1, pair2])
+    return _Node((1 << b1) | (1 << b2), [pair2, pair1])
+
+
+def _assoc(node, shift, h, key, value):
+    """Returns (new_node, added) or (node, False) if nothing changed."""
+    if isinstance(node, _Collision):
+        pairs = list(node.pairs)
+        for i, (k, v) in enumerate(pairs):
+            if k == key:
+                if v is value:
+                    return node, False
+                pairs[i] = (key, value)
+                return _Collision(h, pairs), False
+        pairs.append((key, value))
+        return _Collision(h, pairs), True
+
+    bit = 1 << ((h >> shift) & MASK)
+    pos = (node.bitmap & (bit - 1)).bit_count()
+    if not node.bitmap & bit:
+        entries = list(node.entries)
+        entries.insert(pos, (key, value))
+        return _Node(node.bitmap | bit, entries), True
+
+    entry = node.entries[pos]
+    if isinstance(entry, tuple):
+        k, v = entry
+        if k == key:
+            if v is value:
+                return node, False
+            replacement, added = (key, value), False
+        else:
+            replacement = _pair_node(
+                shift + BITS, _hash(k), entry, h, (key, value)
+            )
+            added = True
+    else:
+        replacement, added = _assoc(entry, shift + BITS, h, key, value)
+        if replacement is entry:
+            return node, False
+
+    entries = list(node.entries)
+    entries[pos] = replacement
+    return _Node(node.bitmap, entries), added
+
+
+def _dissoc(node, shift, h, key):
+    """Returns the node without `key`, None if it became empty, or the
+    same node if `key` was absent."""
+    if isinstance(node, _Collision):
+        pairs = [p for p in node.pairs if p[0] != key]
+        if len(pairs) == len(node.pairs):
+            return node
+        if len(pairs) == 1:
+            return pairs[0]
+        return _Collision(node.hash, pairs)
+
+    bit = 1 << ((h >> shift) & MASK)
+    if not node.bitmap & bit:
+        return node
+    pos = (node.bitmap & (bit - 1)).bit_count()
+    entry = node.entries[pos]
+    if isinstance(entry, tuple):
+        if entry[0] != key:
+            return node
+        replacement = None
+    else:
+        replacement = _dissoc(entry, shift + BITS, h, key)
+        if replacement is entry:
+            return node
+
+    entries = list(node.entries)
+    if replacement is None:
+        del entries[pos]
+        bitmap = node.bitmap & ~bit
+        if not entries:
+            return None
+        return _Node(bitmap, entries)
+    entries[pos] = replacement
+    return _Node(node.bitmap, entries)
+
+
+def _walk(node):
+    if isinstance(node, _Collision):
+        yield from node.pairs
+        return
+    for entry in node.entries:
+        if isinstance(entry, tuple):
+            yield entry
+        else:
+            yield from _walk(entry)
+
+
+class PMap:
+    """Immutable mapping with O(log32 n) set, delete and lookup."""
+
+    __slots__ = ("_root", "_count")
+
+    def __init__(self, mapping=None):
+        self._root = _Node(0, [])
+        self._count = 0
+        if mapping:
+            filled = self.update(mapping)
+            self._root = filled._root
+            self._count = filled._count
+
+    @classmethod
+    def _make(cls, root, count):
+        m = cls.__new__(cls)
+        m._root = root
+        m._count = count
+        return m
+
+    def __len__(self):
+        return self._count
+
+    def get(self, key, default=None):
+        h = _hash(key)
+        node = self._root
+        shift = 0
+        while True:
+            if isinstance(node, _Collision):
+                for k, v in node.pairs:
+                    if k == key:
+                        return v
+                return default
+            bit = 1 << ((h >> shift) & MASK)
+            if not node.bitmap & bit:
+                return default
+            entry = node.entries[(node.bitmap & (bit - 1)).bit_count()]
+            if isinstance(entry, tuple):
+                return entry[1] if entry[0] == key else default
+            node = entry
+            shift += BITS
+
+    def __getitem__(self, key):
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def set(self, key, value):
+        """Return a new map with `key` bound to `value`."""
+        root, added = _assoc(self._root, 0, _hash(key), key, value)
+        if root is self._root:
+            return self
+        return PMap._make(root, self._count + (1 if added else 0))
+
+    def delete(self, key):
+        """Return a new map without `key` (the same map if it is absent)."""
+        root = _dissoc(self._root, 0, _hash(key), key)
+        if root is self._root:
+            return self
+        if root is None:
+            root = _Node(0, [])
+        return PMap._make(root, self._count - 1)
+
+    def update(self, mapping):
+        m = self
+        items = mapping.items() if hasattr(mapping, "items") else mapping
+        for k, v in items:
+            m = m.set(k, v)
+        return m
+
+    def items(self):
+        return _walk(self._root)
+
+    def keys(self):
+        return (k for k, _ in _walk(self._root))
+
+    def values(self):
+        return (v for _, v in _walk(self._root))
+
+    def __iter__(self):
+        return self.keys()
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, (PMap, dict)):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        for k, v in self.items():
+            if other.get(k, _MISSING) != v:
+                return False
+        return True
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"PMap({dict(self.items())!r})"
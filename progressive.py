@@ -0,0 +1,151 @@
+# progressive.py - Build a large subtree over several frames
+#
+#   h("div", {"progressive": True}, rows)    # or a budget in ms per frame
+#
+# The children of a `progressive` element are created breadth first, a chunk
+# per `after` tick, each chunk stopping once BUDGET_MS have passed. The first
+# chunk is built during the mount itself, so the first paint already shows
+# the top of the tree; later chunks run between frames and input events.
+#
+# Elements are created shallow (props and layout, no children) and hold
+# their place as empty frames until the chunks below them are built, so
+# the layout fills in rather than shifting. The geometry calls of each chunk
+# are batched (vdom.layout_batch).
+#
+# Patches that reach the element while it is mounting are merged: children
+# not started yet are built from the new vnodes, and those already built are
+# brought up to date with one patch_children when the mount ends, so several
+# patches in a row collapse into that single patch. Only when that patch
+# would rebuild every child anyway (the built ones no longer match node for
+# node) does the mount start over with the new children.
+#
+# A mount stops when its element is discarded (vdom.discard) or destroyed:
+# the pending chunk is cancelled and nothing more is built.
+import time
+from collections import deque
+
+from vdom import (
+    ElementVNode, _flatten, create_element, discard, has_widget_children,
+    is_discarded, layout_batch, patch_children, same_node,
+)
+
+BUDGET_MS = 8  # Half a 60 fps frame
+TICK_MS = 1  # Gap between chunks; Tk redraws and handles input in it
+
+clock = time.perf_counter
+
+
+def mount(widget, children, budget=True):
+    children = _flatten(children)
+    state = {
+        "budget": BUDGET_MS if budget is True else budget,
+        "mounted": list(children),  # Top-level vnodes being built
+        "target": None,  # Latest children patched in, if any
+        # (vnode, parent, index among the top-level children or None)
+        "queue": deque((c, widget, i) for i, c in enumerate(children)),
+        "job": None,
+        "chunks": 0,
+    }
+    if not hasattr(widget, "_progressive"):
+        widget.bind("<Destroy>", lambda e: _on_destroy(widget, e), add="+")
+    setattr(widget, "_progressive", state)
+    _step(widget, state)
+
+
+def patch(widget, children):
+    """Merge new children into the mount in progress."""
+    state = widget._progressive
+    children = _flatten(children)
+    mounted = state["mounted"]
+    # Top-level children are queued first, so the ones not started yet are
+    # a suffix of the list and the front of the queue.
+    queue = state["queue"]
+    started = len(mounted)
+    while queue and queue[0][2] is not None:
+        queue.popleft()
+        started -= 1
+    del mounted[started:]
+    # They are built from the new vnodes instead
+    for i in range(len(children) - 1, started - 1, -1):
+        queue.appendleft((children[i], widget, i))
+    mounted.extend(children[started:])
+    state["target"] = children
+
+
+def _step(widget, state):
+    state["job"] = None
+    try:
+        if not widget.winfo_exists() or is_discarded(widget):
+            return
+    except Exception:
+        return
+    queue = state["queue"]
+    deadline = clock() + state["budget"] / 1000
+    with layout_batch():
+        while queue:
+            vnode, parent, _ = queue.popleft()
+            w = create_element(vnode, parent, children=False)
+            if (
+                w is not None and isinstance(vnode, ElementVNode)
+                and has_widget_children(w, vnode)
+            ):
+                queue.extend((c, w, None) for c in vnode.children)
+            if clock() >= deadline:
+                break
+    state["chunks"] += 1
+    if queue:
+        state["job"] = widget.after(TICK_MS, lambda: _step(widget, state))
+    else:
+        _finish(widget, state)
+
+
+def _finish(widget, state):
+    widget._progressive = None
+    mounted, target = state["mounted"], state["target"]
+    if target is None:
+        return
+    if len(mounted) == len(target) and all(
+        same_node(a, b) for a, b in zip(mounted, target)
+    ):
+        with layout_batch():
+            patch_children(widget, mounted, target)
+    else:
+        # patch_children would rebuild every child; do it progressively
+        discard(widget.winfo_children())
+        mount(widget, target, state["budget"])
+
+
+def cancel(widget):
+    """Stop a mount in progress, leaving what is built so far."""
+    state = getattr(widget, "_progressive", None)
+    if state is None:
+        return
+    widget._progressive = None
+    if state["job"] is not None:
+        try:
+            widget.after_cancel(state["job"])
+        except Exception:
+            pass
+        state["job"] = None
+
+
+def _on_destroy(widget, event):
+    if event.widget is widget:
+        cancel(widget)
+
+
+def flush(widget):
+    """Build the rest of a mount in progress now."""
+    state = getattr(widget, "_progressive", None)
+    if state is None:
+        return
+    if state["job"] is not None:
+        widget.after_cancel(state["job"])
+    state["budget"] = float("inf")
+    _step(widget, state)
+
+
+def pending(widget):
+    """Vnodes still to be built under `widget` (0 once mounted)."""
+    state = getattr(widget, "_progressive", None)
+    return len(state["queue"]) if state is not None else 0
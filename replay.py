@@ -0,0 +1,244 @@
+# replay.py - Record app traffic and replay it headlessly to reproduce slow frames
+#
+# Recording (main.py does this when RTK_RECORD=<path> is set):
+#
+#   recorder = Recorder(path)
+#   recorder.install()             # before the tree is built
+#   recorder.attach(app)           # app from runner.run_component
+#   ...
+#   recorder.uninstall()
+#
+# Replaying:
+#
+#   python replay.py trace.rtk [--realtime] [--top 10]
+#
+# A trace is an append-only file with one compact JSON array per line:
+#
+#   [t_ms, "send", msg]                       runner.App.send(msg)
+#   [t_ms, "cmd", path]                       command= callback of a widget
+#   [t_ms, "evt", [path, prop, text]]         on_* handler (entry text or null)
+#   [t_ms, "req", [scheduler, priority]]      Scheduler.request
+#   [t_ms, "flush", [scheduler, kind]]        scheduler ran a render
+#
+# `path` is the widget's child-index path from the toplevel. The replayer
+# rebuilds the same MultiViewWithPortal tree on the headless backend, drives
+# the virtual clock to each record's timestamp (so scheduler timers fire in
+# the same order) and times every step.
+import argparse
+import json
+import sys
+import time
+
+import vdom
+from scheduler import Scheduler
+
+
+def widget_path(widget):
+    path = []
+    while getattr(widget, "master", None) is not None:
+        path.append(widget.master.winfo_children().index(widget))
+        widget = widget.master
+    return path[::-1]
+
+
+def widget_at(root, path):
+    widget = root
+    for index in path:
+        widget = widget.winfo_children()[index]
+    return widget
+
+
+class Recorder:
+    def __init__(self, path, clock=time.perf_counter):
+        self.file = open(path, "a", buffering=1)
+        self.clock = clock
+        self.start = clock()
+        self._restore = []
+
+    def write(self, kind, payload):
+        t = round((self.clock() - self.start) * 1000, 3)
+        self.file.write(json.dumps([t, kind, payload], separators=(",", ":")))
+        self.file.write("\n")
+
+    def _patch(self, owner, name, replacement):
+        self._restore.append((owner, name, owner.__dict__.get(name)))
+        setattr(owner, name, replacement)
+
+    def attach(self, app):
+        """Record every message sent to `app`."""
+        app_send = app.send
+
+        def send(msg):
+            self.write("send", msg)
+            return app_send(msg)
+
+        self._patch(app, "send", send)
+
+    def install(self):
+        """Hook callbacks and scheduler decisions. Install before mounting
+        so callbacks of the first render are recorded too."""
+        rec = self
+        set_prop = vdom.set_prop
+
+        def recording_set_prop(w, name, value):
+            if callable(value) and name == "command":
+                value = rec._wrap_command(w, value)
+            elif callable(value) and name in vdom.EVENT_PROPS:
+                value = rec._wrap_event(name, value)
+            return set_prop(w, name, value)
+
+        request = Scheduler.request
+        run_high = Scheduler._run_high_priority
+        run_low = Scheduler._run_low_priority
+        flush = Scheduler.flush
+
+        def sched_request(scheduler, priority="low", **limits):
+            if not limits or all(v is None for v in limits.values()):
+                rec.write("req", [scheduler.name, priority])
+            return request(scheduler, priority, **limits)
+
+        def sched_high(scheduler):
+            rec.write("flush", [scheduler.name, "high"])
+            return run_high(scheduler)
+
+        def sched_low(scheduler):
+            rec.write("flush", [scheduler.name, "low"])
+            return run_low(scheduler)
+
+        def sched_flush(scheduler):
+            rec.write("flush", [scheduler.name, "sync"])
+            return flush(scheduler)
+
+        self._patch(vdom, "set_prop", recording_set_prop)
+        self._patch(Scheduler, "request", sched_request)
+        self._patch(Scheduler, "_run_high_priority", sched_high)
+        self._patch(Scheduler, "_run_low_priority", sched_low)
+        self._patch(Scheduler, "flush", sched_flush)
+
+    def _wrap_command(self, widget, fn):
+        def command(*args):
+            self.write("cmd", widget_path(widget))
+            return fn(*args)
+        return command
+
+    def _wrap_event(self, prop, fn):
+        def handler(event):
+            text = None
+            if vdom.get_backend().is_entry(event.widget):
+                text = event.widget.get()
+            self.write("evt", [widget_path(event.widget), prop, text])
+            return fn(event)
+        return handler
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._restore):
+            if original is None:
+                delattr(owner, name)
+            else:
+                setattr(owner, name, original)
+        self._restore.clear()
+        self.file.close()
+
+
+def read_trace(path):
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def build_app(backend, title="Multi-View + Portal"):
+    """Same tree main.main() builds, on the given (headless) backend."""
+    from multi_view_with_portal import MultiViewWithPortal
+    from runner import run_component
+
+    root = backend.root()
+    app_frame = backend.create("div", root)
+    app_frame.pack(fill="both", expand=True)
+    external = backend.create("div", root)
+    external.pack(fill="x")
+    app = run_component(MultiViewWithPortal({"title": title}, app_frame, external))
+    return root, app
+
+
+class Replayer:
+    def __init__(self, records, build=build_app):
+        from headless import HeadlessBackend
+
+        self.records = list(records)
+        self.backend = HeadlessBackend()
+        self.build = build
+        self.steps = []  # (record index, kind, ms, widget ops)
+
+    def run(self, realtime=False):
+        previous = vdom.get_backend()
+        vdom.set_backend(self.backend)
+        try:
+            root, app = self.build(self.backend)
+            wall_start = time.perf_counter()
+            for i, (t, kind, payload) in enumerate(self.records):
+                if kind in ("req", "flush"):
+                    continue  # Reproduced by the scheduler itself
+                if realtime:
+                    delay = t / 1000 - (time.perf_counter() - wall_start)
+                    if delay > 0:
+                        time.sleep(delay)
+                ops = self.backend.total()
+                start = time.perf_counter()
+                root.advance(max(0, int(t) - root.now))
+                self._apply(root, app, kind, payload)
+                root.update()
+                elapsed = (time.perf_counter() - start) * 1000
+                self.steps.append((i, kind, elapsed, self.backend.total() - ops))
+            app.close()
+        finally:
+            vdom.set_backend(previous)
+        return self.steps
+
+    def _apply(self, root, app, kind, payload):
+        if kind == "send":
+            app.send(payload)
+        elif kind == "cmd":
+            widget_at(root, payload).invoke()
+        elif kind == "evt":
+            path, prop, text = payload
+            widget = widget_at(root, path)
+            if text is not None and self.backend.is_entry(widget):
+                widget.delete(0, "end")
+                widget.insert(0, text)
+            widget.event_generate(vdom.EVENT_PROPS[prop][0])
+
+    def expected_flushes(self):
+        return sum(1 for _, kind, _ in self.records if kind == "flush")
+
+    def report(self, top=10, file=None):
+        file = file or sys.stdout
+        total = sum(ms for _, _, ms, _ in self.steps)
+        print(
+            f"{len(self.steps)} steps in {total:.1f} ms "
+            f"({self.expected_flushes()} renders recorded)",
+            file=file,
+        )
+        print(f"{'step':>6} {'kind':<6} {'ms':>9} {'ops':>7}  payload", file=file)
+        for i, kind, ms, ops in sorted(self.steps, key=lambda s: -s[2])[:top]:
+            payload = json.dumps(self.records[i][2])[:60]
+            print(f"{i:>6} {kind:<6} {ms:>9.3f} {ops:>7}  {payload}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay a recorded trace headlessly")
+    parser.add_argument("trace")
+    parser.add_argument("--realtime", action="store_true",
+                        help="wait between steps as the original session did")
+    parser.add_argument("--top", type=int, default=10,
+                        help="number of slowest steps to show")
+    args = parser.parse_args(argv)
+
+    replayer = Replayer(read_trace(args.trace))
+    replayer.run(realtime=args.realtime)
+    replayer.report(top=args.top)
+
+
+if __name__ == "__main__":
+    main()
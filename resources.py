@@ -0,0 +1,179 @@
+# resources.py - Shared fonts, images and ttk styles
+#
+#   resources.define_font("heading", (FONT_FAMILY, 16, "bold"))
+#   resources.define_image("logo", file="logo.png")
+#
+#   h("h2", {"text": "Title", "font": "heading"})          # a defined key
+#   h("span", {"font": (FONT_FAMILY, 12, "bold")})         # or a font spec
+#   h("span", {"image": "logo"})
+#   h("button", {"style": {"base": "TButton", "foreground": "red"}})
+#
+# Each resource is created once per interpreter and widgets are configured
+# with its name, so Tk never re-parses a font spec or re-decodes an image:
+#
+# - fonts become named fonts ("rtk:heading", "rtk:font3"), one per key or
+#   distinct spec, shared by every widget and canvas item that uses them;
+# - images are PhotoImages loaded on first use and reference counted per
+#   widget. Unused images stay in an LRU of MAX_IDLE_IMAGES so switching back
+#   to a view does not reload them; older ones are deleted;
+# - style dicts become derived ttk styles ("rtk1.TButton") configured once
+#   per distinct option set.
+#
+# The cache lives on the root widget, so headless and Tk trees never share
+# resources.
+from collections import OrderedDict
+
+# Unreferenced images kept loaded before the least recently used is deleted
+MAX_IDLE_IMAGES = 16
+
+FONTS = {"heading": ("Cascadia Mono", 16, "bold")}  # key -> font spec
+IMAGES = {}  # key -> PhotoImage options
+
+
+def define_font(key, spec):
+    """Register a font spec (tuple or Tk font string) under `key`."""
+    FONTS[key] = spec
+
+
+def define_image(key, **options):
+    """Register PhotoImage options (file=, data=, ...) under `key`."""
+    IMAGES[key] = options
+
+
+class ResourceCache:
+    def __init__(self, backend, root):
+        self.backend = backend
+        self.root = root
+        self.fonts = {}  # key or spec -> font name
+        self._font_objects = []  # Keeps tkinter from deleting named fonts
+        self.images = {}  # key -> [image, refcount]
+        self.idle = OrderedDict()  # key -> image, least recently used first
+        self.styles = {}  # (base, options) -> style name
+        self.loads = 0
+
+    # -- fonts
+    def font(self, value):
+        """Named font for a defined key or a spec; other strings (Tk font
+        names such as "TkDefaultFont") pass through."""
+        if isinstance(value, list):
+            value = tuple(value)
+        name = self.fonts.get(value)
+        if name is not None:
+            return name
+        if value in FONTS:
+            name, spec = f"rtk:{value}", FONTS[value]
+        elif isinstance(value, tuple):
+            name, spec = f"rtk:font{len(self.fonts)}", value
+        else:
+            return value
+        font = self.backend.named_font(self.root, name, spec)
+        self._font_objects.append(font)
+        self.fonts[value] = name
+        self.fonts.setdefault(spec, name)  # A key and its spec share a font
+        return name
+
+    # -- images
+    def acquire(self, key):
+        entry = self.images.get(key)
+        if entry is not None:
+            entry[1] += 1
+            return entry[0]
+        image = self.idle.pop(key, None)
+        if image is None:
+            options = IMAGES.get(key)
+            if options is None:
+                print(f"Unknown image {key!r}")
+                return None
+            image = self.backend.photo_image(self.root, f"rtk:{key}", options)
+            self.loads += 1
+        self.images[key] = [image, 1]
+        return image
+
+    def release(self, key):
+        entry = self.images.get(key)
+        if entry is None:
+            return
+        entry[1] -= 1
+        if entry[1] > 0:
+            return
+        del self.images[key]
+        self.idle[key] = entry[0]
+        while len(self.idle) > MAX_IDLE_IMAGES:
+            _, image = self.idle.popitem(last=False)
+            self.backend.delete_image(image)
+
+    # -- styles
+    def style(self, spec):
+        options = {k: v for k, v in spec.items() if k != "base"}
+        if "font" in options:
+            options["font"] = self.font(options["font"])
+        key = (spec.get("base", "TFrame"), tuple(sorted(options.items())))
+        name = self.styles.get(key)
+        if name is None:
+            name = f"rtk{len(self.styles) + 1}.{key[0]}"
+            self.backend.configure_style(self.root, name, options)
+            self.styles[key] = name
+        return name
+
+    def stats(self):
+        return {
+            "fonts": len(set(self.fonts.values())),
+            "images": len(self.images),
+            "idle_images": len(self.idle),
+            "image_loads": self.loads,
+            "styles": len(self.styles),
+        }
+
+
+def cache(backend, widget):
+    """The ResourceCache of `widget`'s root, created on first use."""
+    root = widget
+    while getattr(root, "master", None) is not None:
+        root = root.master
+    resources = getattr(root, "_resources", None)
+    if resources is None:
+        resources = ResourceCache(backend, root)
+        setattr(root, "_resources", resources)
+    return resources
+
+
+def font(backend, widget, value):
+    return cache(backend, widget).font(value)
+
+
+def style(backend, widget, spec):
+    if not isinstance(spec, dict):
+        return spec
+    return cache(backend, widget).style(spec)
+
+
+def set_image(backend, widget, key):
+    """Point `widget`'s image at the cached image `key` (None clears it)."""
+    resources = cache(backend, widget)
+    old = getattr(widget, "_image_key", None)
+    if old == key:
+        return
+    image = resources.acquire(key) if key is not None else None
+    try:
+        widget.config(image=image if image is not None else "")
+    except Exception:
+        pass
+    if image is not None and not hasattr(widget, "_image_key"):
+        # Drop the reference when the widget goes away
+        widget.bind(
+            "<Destroy>",
+            lambda e: _on_destroy(resources, widget, e),
+            add="+",
+        )
+    if old is not None:
+        resources.release(old)
+    setattr(widget, "_image_key", key if image is not None else None)
+
+
+def _on_destroy(resources, widget, event):
+    if event.widget is not widget:
+        return
+    key = getattr(widget, "_image_key", None)
+    if key is not None:
+        widget._image_key = None
+        resources.release(key)
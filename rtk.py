@@ -1,12 +1,13 @@
 # rtk.py - Framework utilities (static functions only)
-from tkinter import ttk
-from vdom import mount_vdom, ComponentVNode
+import importlib
+
+from vdom import mount_vdom, ComponentVNode, get_backend
 from scheduler import Scheduler
 
 
 def create_host(parent_container, pack_options=None):
     """Create a standard host container. Only for top-level or special cases."""
-    host = ttk.Frame(parent_container)
+    host = get_backend().create("div", parent_container)
     if pack_options:
         host.pack(**pack_options)
     return host
@@ -20,6 +21,16 @@ def create_component(component_factory, parent_container, *extra_args):
     return component
 
 
+def lazy_component(module, name):
+    """Component factory that imports `module` when first mounted, so
+    views not shown at startup cost no import time until they are."""
+    def factory(*args):
+        return getattr(importlib.import_module(module), name)(*args)
+
+    factory.__qualname__ = name
+    return factory
+
+
 def send_to_component(component, message):
     """Send message to a specific component and return its events"""
     try:
@@ -69,10 +80,12 @@ def find_component_containers(widget):
     return containers
 
 
-def init_components_from_host(host, components_dict):
+def init_components_from_host(host, components_dict, deferred=True):
     """
     Initialize any uninitialized ComponentVNodes found in host widget tree.
     Safe to call multiple times - only initializes missing components.
+    With deferred=False, components declared with defer=True are skipped
+    (a later call picks them up).
     Returns True if any new components were initialized.
     """
     if not host or not hasattr(host, 'winfo_exists') or not host.winfo_exists():
@@ -84,6 +97,8 @@ def init_components_from_host(host, components_dict):
         vnode = getattr(container, '_vnode', None)
         if not vnode or not vnode.key:
             continue
+        if vnode.defer and not deferred:
+            continue
             
         # Only initialize if not already in components dict
         if vnode.key not in components_dict:
@@ -130,7 +145,8 @@ def has_uninitialized_components(host, components_dict):
 def create_component_mount(host, render_fn, parent_container):
     """Create mount_vdom and scheduler for a component"""
     update, unmount = mount_vdom(host, render_fn)
-    scheduler = Scheduler(update, parent_container.winfo_toplevel())
+    name = getattr(render_fn, "__qualname__", "").split(".", 1)[0] or None
+    scheduler = Scheduler(update, parent_container.winfo_toplevel(), name)
     return update, unmount, scheduler
 
 
@@ -1,24 +1,175 @@
 # scheduler.py
+def _toplevel(widget):
+    while getattr(widget, "master", None) is not None:
+        widget = widget.master
+    return widget
+
+
+def _root_from_args(args):
+    """The toplevel of the widget an event handler was called for."""
+    widget = getattr(args[0], "widget", None) if args else None
+    if widget is None:
+        raise RuntimeError(
+            "debounce/throttle could not find a Tk root from the call's "
+            "arguments; pass root= when wrapping a callback without an event"
+        )
+    return _toplevel(widget)
+
+
+class _RateLimited:
+    """Base for debounce/throttle wrappers: a callable driven by Tk timers.
+
+    `calls` counts invocations of the wrapper, `runs` invocations of `fn`;
+    the difference is how many calls were coalesced.
+    """
+
+    def __init__(self, fn, ms, root=None, leading=False, trailing=True):
+        self.fn = fn
+        self.ms = ms
+        self.root = _toplevel(root) if root is not None else None
+        self.leading = leading
+        self.trailing = trailing
+        self.job_id = None
+        self.pending_args = None
+        self.calls = 0
+        self.runs = 0
+
+    @property
+    def coalesced(self):
+        return self.calls - self.runs
+
+    def _root(self, args):
+        if self.root is None:
+            self.root = _root_from_args(args)
+        return self.root
+
+    def _run(self, args):
+        self.runs += 1
+        return self.fn(*args)
+
+    def _schedule(self, args):
+        self.job_id = self._root(args).after(self.ms, self._expire)
+
+    def _expire(self):
+        self.job_id = None
+        args, self.pending_args = self.pending_args, None
+        if args is not None and self.trailing:
+            self._run(args)
+
+    def pending(self):
+        return self.job_id is not None
+
+    def suspend(self):
+        """Stop the timer but keep the pending trailing call for flush()."""
+        if self.job_id is not None:
+            try:
+                self.root.after_cancel(self.job_id)
+            except Exception:
+                pass
+            self.job_id = None
+
+    def cancel(self):
+        """Drop the pending trailing call, if any."""
+        self.suspend()
+        self.pending_args = None
+
+    def flush(self):
+        """Run the pending trailing call now."""
+        args = self.pending_args
+        self.cancel()
+        if args is not None:
+            return self._run(args)
+
+
+class Debounced(_RateLimited):
+    """Runs `fn` once calls have stopped for `ms` (trailing) and/or on the
+    first call of a burst (leading)."""
+
+    def __call__(self, *args):
+        self.calls += 1
+        idle = self.job_id is None
+        if self.job_id is not None:
+            try:
+                self.root.after_cancel(self.job_id)
+            except Exception:
+                pass
+        self._schedule(args)
+        if idle and self.leading:
+            self.pending_args = None
+            return self._run(args)
+        self.pending_args = args
+
+
+class Throttled(_RateLimited):
+    """Runs `fn` at most once per `ms`: at the start of a window (leading)
+    and/or with the last arguments at its end (trailing)."""
+
+    def __call__(self, *args):
+        self.calls += 1
+        if self.job_id is None:
+            self._schedule(args)
+            if self.leading:
+                return self._run(args)
+        self.pending_args = args
+
+    def _expire(self):
+        args = self.pending_args
+        super()._expire()
+        if args is not None and self.trailing:
+            # Keep the window closed after a trailing run
+            self._schedule(args)
+
+
+def debounce(ms, root=None, leading=False, trailing=True):
+    """Decorator form: `on_filter = debounce(150)(on_filter)`.
+
+    `root` may be any widget; its toplevel is used. Without it, the
+    toplevel is taken from the event's widget on the first call, so it can
+    wrap event props directly; callbacks called without an event (a
+    `command`) need `root`.
+    """
+    return lambda fn: Debounced(fn, ms, root, leading, trailing)
+
+
+def throttle(ms, root=None, leading=True, trailing=True):
+    """Decorator form of Throttled, see debounce()."""
+    return lambda fn: Throttled(fn, ms, root, leading, trailing)
+
+
 class Scheduler:
-    def __init__(self, flush_fn, tk_root):
+    def __init__(self, flush_fn, tk_root, name=None):
         self.flush_fn = flush_fn
         self.root = tk_root
+        self.name = name  # For traces and diagnostics
         self.high_priority_queued = False
         self.low_priority_queued = False
         self.deferred = False
         self.pending_high_job_id = None
         self.pending_low_job_id = None
+        self.limiters = {}  # (priority, kind, ms) -> Debounced/Throttled
+        self.requests = 0
+        self.renders = 0
         
         # Timing configuration
         self.high_priority_delay = 0  # Immediate (after_idle)
         self.low_priority_delay = 16  # ~60fps (16ms delay)
 
-    def request(self, priority="low"):
+    def request(self, priority="low", debounce=None, throttle=None):
         """Request a render update with specified priority
         
         Args:
             priority: "high" for immediate response, "low" for batched updates
+            debounce: ms of quiet to wait for before requesting
+            throttle: request at most once per this many ms
         """
+        if debounce is not None:
+            self._limiter(priority, Debounced, debounce)()
+            return
+        if throttle is not None:
+            self._limiter(priority, Throttled, throttle)()
+            return
+
+        self.requests += 1
         if priority == "high":
             self._request_high_priority()
             return
@@ -29,6 +180,30 @@ class Scheduler:
         
         self._request_low_priority()
 
+    def _limiter(self, priority, kind, ms):
+        key = (priority, kind.__name__, ms)
+        limiter = self.limiters.get(key)
+        if limiter is None:
+            limiter = kind(lambda: self.request(priority), ms, self.root)
+            self.limiters[key] = limiter
+        return limiter
+
+    def _cancel_limiters(self):
+        for limiter in self.limiters.values():
+            limiter.cancel()
+
+    def stats(self):
+        """Requests made (including debounced/throttled ones), renders run,
+        and how many requests were coalesced into another's render."""
+        requests = self.requests + sum(
+            limiter.coalesced for limiter in self.limiters.values()
+        )
+        return {
+            "requests": requests,
+            "renders": self.renders,
+            "coalesced": max(0, requests - self.renders),
+        }
+
     def _request_high_priority(self):
         """Request immediate high priority render"""
         if self.high_priority_queued:
@@ -76,6 +251,9 @@ class Scheduler:
     def defer(self):
         """Enter deferred mode - stops all rendering until flush() is called"""
         self.deferred = True
+        # Pending trailing requests are kept for flush() to account for
+        for limiter in self.limiters.values():
+            limiter.suspend()
         
         # Cancel any pending renders
         if self.pending_high_job_id is not None:
@@ -99,6 +277,9 @@ class Scheduler:
         """Exit deferred mode and immediately execute a render"""
         was_deferred = self.deferred
         had_pending = self.high_priority_queued or self.low_priority_queued
+        for limiter in self.limiters.values():
+            had_pending = had_pending or limiter.pending_args is not None
+        self._cancel_limiters()
         
         self.deferred = False
         
@@ -122,6 +303,7 @@ class Scheduler:
         
         # If we were in deferred mode or had pending renders, execute now
         if was_deferred or had_pending:
+            self.renders += 1
             self.flush_fn()
 
     def _run_high_priority(self):
@@ -133,6 +315,7 @@ class Scheduler:
         if self.deferred:
             return
             
+        self.renders += 1
         self.flush_fn()
 
     def _run_low_priority(self):
@@ -144,11 +327,13 @@ class Scheduler:
         if self.deferred:
             return
             
+        self.renders += 1
         self.flush_fn()
 
     def cancel(self):
         """Cancel any pending renders and exit deferred mode"""
         self.deferred = False
+        self._cancel_limiters()
         self.high_priority_queued = False
         self.low_priority_queued = False
         
@@ -0,0 +1,61 @@
+# startup.py - Time the phases of application startup
+#
+#   timer = StartupTimer(report=("paint", "interactive"))  # as early as possible
+#   ... imports ...
+#   timer.mark("import")
+#   root = tk.Tk()
+#   timer.mark("tk")
+#   ...
+#   timer.on_first_paint(root)      # marks "paint"
+#   timer.mark("interactive")       # e.g. when the first pump has run
+#
+# Each mark records the time since the previous one, so the phases add up to
+# the total. The report is printed once every phase in `report` is marked.
+# First paint is the first idle callback after the root window is mapped:
+# Tk has run the redraws that mapping queued by then.
+import sys
+import time
+
+
+class StartupTimer:
+    def __init__(self, report=(), clock=time.perf_counter, file=None):
+        self.clock = clock
+        self.start = clock()
+        self.last = self.start
+        self.phases = {}  # phase -> ms, in order of marking
+        self.report = tuple(report)
+        self.file = file
+        self.reported = False
+
+    def mark(self, phase):
+        """Record `phase` as ending now; the first mark of a phase wins."""
+        if phase in self.phases:
+            return
+        now = self.clock()
+        self.phases[phase] = (now - self.last) * 1000
+        self.last = now
+        if (
+            self.report and not self.reported
+            and all(p in self.phases for p in self.report)
+        ):
+            self.reported = True
+            print(self.format(), file=self.file or sys.stdout)
+
+    def total(self):
+        return (self.last - self.start) * 1000
+
+    def format(self):
+        detail = ", ".join(f"{k} {ms:.1f}" for k, ms in self.phases.items())
+        return f"startup: {self.total():.1f} ms ({detail})"
+
+    def on_first_paint(self, root):
+        """Mark "paint" once the root window has been drawn."""
+        done = False
+
+        def mapped(event):
+            nonlocal done
+            if event.widget is root and not done:
+                done = True
+                root.after_idle(lambda: self.mark("paint"))
+
+        root.bind("<Map>", mapped, add="+")
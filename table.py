@@ -0,0 +1,223 @@
+# table.py - Virtualized `table` element on ttk.Treeview
+#
+#   h("table", {
+#       "columns": [{"key": "name", "title": "Name", "width": 160},
+#                   {"key": "size", "title": "Size", "anchor": "e"}],
+#       "rows": rows,              # sequence of tuples/dicts, or a ColumnTable
+#       "height": 20,              # visible rows (a Treeview option)
+#       "sort": ("size", True),    # optional (column key, descending)
+#       "on_sort": on_sort,        # optional, called on heading clicks
+#   })
+#
+# Only the `height` visible rows exist as Treeview items. They are fixed
+# slots whose values are updated in place with `item`, so scrolling, sorting
+# and source changes cost at most one call per visible row that changed and
+# never a full reload. Sorting uses a permutation computed once per (source,
+# column, direction) from per-column sort keys, so rows are not
+# materialized to sort. Wheel and arrow keys scroll the window.
+#
+# Rows are cached by identity: pass a new sequence (e.g. a PVector) when the
+# data changes rather than mutating the old one in place.
+import sys
+
+
+def _columns(props):
+    out = []
+    for c in props.get("columns") or ():
+        out.append({"key": c, "title": str(c)} if isinstance(c, str) else c)
+    return out
+
+
+def _spec(columns):
+    # What the Treeview shows; format/sort_key callables may be fresh
+    # closures on every render and are not compared.
+    return [
+        tuple(c.get(k) for k in ("key", "title", "width", "anchor", "stretch"))
+        for c in columns
+    ]
+
+
+def _is_column_table(rows):
+    # A ColumnTable can only be passed in if columns.py is already loaded
+    columns = sys.modules.get("columns")
+    return columns is not None and isinstance(rows, columns.ColumnTable)
+
+
+def _cell(rows, i, position, column):
+    if _is_column_table(rows):
+        value = rows.columns[column["key"]][i]
+    else:
+        row = rows[i]
+        value = row[column["key"]] if isinstance(row, dict) else row[position]
+    fmt = column.get("format")
+    return fmt(value) if fmt is not None else str(value)
+
+
+def _sort_keys(state, position, column):
+    """Per-column sort keys, computed once per source."""
+    keys = state["keys"].get(column["key"])
+    if keys is None:
+        rows = state["rows"]
+        key = column.get("sort_key")
+        keys = []
+        for i in range(len(rows)):
+            row = rows[i]
+            value = row[column["key"]] if isinstance(row, dict) else row[position]
+            keys.append(key(value) if key is not None else value)
+        state["keys"][column["key"]] = keys
+    return keys
+
+
+def _order(state):
+    """Row permutation for the current sort, or None for source order."""
+    sort = state["sort"]
+    if not sort:
+        return None
+    name, descending = sort
+    order = state["orders"].get(sort)
+    if order is None and (name, not descending) in state["orders"]:
+        # The other direction is already known (ties come out reversed)
+        order = state["orders"][(name, not descending)][::-1]
+        state["orders"][sort] = order
+    if order is None:
+        rows = state["rows"]
+        if _is_column_table(rows):
+            order = rows.sort(name, descending=descending)
+        else:
+            columns = state["columns"]
+            position = next(
+                i for i, c in enumerate(columns) if c["key"] == name
+            )
+            keys = _sort_keys(state, position, columns[position])
+            order = sorted(range(len(keys)), key=keys.__getitem__,
+                           reverse=descending)
+        state["orders"][sort] = order
+    return order
+
+
+def _window(state):
+    rows = state["rows"]
+    n = len(rows) if rows is not None else 0
+    height = state["height"]
+    start = max(0, min(state["offset"], n - height))
+    state["offset"] = start
+    stop = min(n, start + height)
+    order = _order(state)
+    indices = order[start:stop] if order is not None else range(start, stop)
+    columns = state["columns"]
+    return [
+        tuple(_cell(rows, i, p, c) for p, c in enumerate(columns))
+        for i in indices
+    ]
+
+
+# -------------------------
+# Mount / patch
+# -------------------------
+def mount(tree, props):
+    state = {
+        "columns": [],
+        "rows": None,
+        "length": 0,
+        "keys": {},
+        "orders": {},
+        "sort": None,
+        "on_sort": None,
+        "offset": 0,
+        "height": 10,
+        "slots": [],  # values shown by item "r<i>"
+    }
+    setattr(tree, "_table", state)
+    try:
+        tree.bind("<MouseWheel>", lambda e: scroll(tree, -1 if e.delta > 0 else 1))
+        tree.bind("<Button-4>", lambda e: scroll(tree, -1))
+        tree.bind("<Button-5>", lambda e: scroll(tree, 1))
+        tree.bind("<Up>", lambda e: scroll(tree, -1))
+        tree.bind("<Down>", lambda e: scroll(tree, 1))
+    except Exception:
+        pass
+    patch(tree, {}, props)
+
+
+def patch(tree, old_props, props):
+    state = tree._table
+    columns = _columns(props)
+    columns_changed = _spec(columns) != _spec(state["columns"])
+    state["columns"] = columns
+    if columns_changed:
+        _set_columns(tree, state, columns)
+    rows = props.get("rows")
+    length = len(rows) if rows is not None else 0
+    if rows is not state["rows"] or length != state["length"]:
+        state["rows"] = rows
+        state["length"] = length
+        state["keys"].clear()
+        state["orders"].clear()
+    state["height"] = props.get("height", 10)
+    state["on_sort"] = props.get("on_sort")
+    if columns_changed or props.get("sort") != old_props.get("sort"):
+        state["sort"] = _sort_tuple(props.get("sort"))
+    if "offset" in props and props.get("offset") != old_props.get("offset"):
+        state["offset"] = props["offset"]
+    _apply(tree, state)
+
+
+def _sort_tuple(sort):
+    return tuple(sort) if sort else None
+
+
+def _set_columns(tree, state, columns):
+    state["keys"].clear()
+    state["orders"].clear()
+    keys = [c["key"] for c in columns]
+    tree.configure(columns=keys, show="headings")
+    for c in columns:
+        tree.heading(
+            c["key"], text=c.get("title", c["key"]),
+            command=lambda k=c["key"]: _on_heading(tree, k),
+        )
+        options = {k: c[k] for k in ("width", "anchor", "stretch") if k in c}
+        if options:
+            tree.column(c["key"], **options)
+    # Values of existing slots no longer line up with the columns
+    state["slots"] = [None] * len(state["slots"])
+
+
+def _apply(tree, state):
+    """Bring the visible slots in line with the current window."""
+    values = _window(state)
+    slots = state["slots"]
+    for i, row in enumerate(values):
+        if i < len(slots):
+            if slots[i] != row:
+                tree.item(f"r{i}", values=row)
+                slots[i] = row
+        else:
+            tree.insert("", "end", iid=f"r{i}", values=row)
+            slots.append(row)
+    if len(slots) > len(values):
+        tree.delete(*[f"r{i}" for i in range(len(values), len(slots))])
+        del slots[len(values):]
+
+
+def scroll(tree, rows):
+    """Move the visible window by `rows` (negative scrolls up)."""
+    state = tree._table
+    state["offset"] = max(0, state["offset"] + rows)
+    _apply(tree, state)
+    return "break"
+
+
+def _on_heading(tree, key):
+    state = tree._table
+    descending = state["sort"] == (key, False)
+    state["sort"] = (key, descending)
+    state["offset"] = 0
+    _apply(tree, state)
+    if state["on_sort"] is not None:
+        state["on_sort"](key, descending)
+
+
+def visible_rows(tree):
+    """Values of the rows currently shown, top to bottom."""
+    return list(tree._table["slots"])
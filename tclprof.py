@@ -0,0 +1,176 @@
+# tclprof.py - Opt-in profiler for Python -> Tcl round trips
+#
+#   profiler = TclProfiler(root)
+#   profiler.install()
+#   ...                       # call profiler.next_frame() once per pump
+#   profiler.uninstall()
+#   profiler.dump_folded("tcl.folded")   # flamegraph.pl / speedscope input
+#
+# The profiler swaps the interpreter object that widgets reach through
+# `widget.tk` for a proxy that times every call()/eval(). Each Tcl command is
+# attributed to the component whose mount is updating (from the Python stack)
+# and to the vdom phase that issued it: create, patch, layout or destroy.
+import sys
+import time
+from collections import defaultdict
+from tkinter import Misc
+
+# vdom functions -> phase, innermost match wins
+PHASES = {
+    "create_element": "create",
+    "patch_widget": "patch",
+    "_patch_element": "patch",
+    "patch_children": "patch",
+    "patch_listbox": "patch",
+    "set_prop": "patch",
+    "patch_recursive": "patch",
+    "_mount_portal": "patch",
+    "_patch_slot": "patch",
+    "_place_slot": "patch",
+    "_remove_slot": "destroy",
+    "unmount": "destroy",
+    "discard": "destroy",
+    "flush_discarded": "destroy",
+    "_set_layout": "layout",
+    "_flush_layout": "layout",
+}
+
+# Commands whose first argument is a subcommand worth keeping
+SUBCOMMANDS = {
+    "winfo", "pack", "grid", "place", "wm", "after", "bind", "image",
+    "font", "ttk::style", "focus", "update",
+}
+
+
+def command_name(args):
+    """Readable name for a Tcl command: 'pack', 'winfo children',
+    'label configure' (widget commands use the widget's class)."""
+    if not args:
+        return "?"
+    head = str(args[0])
+    if head.startswith("."):
+        leaf = head.rsplit(".", 1)[-1].lstrip("!").rstrip("0123456789")
+        sub = str(args[1]) if len(args) > 1 else ""
+        return f"{leaf or 'widget'} {sub}".strip()
+    if head in SUBCOMMANDS and len(args) > 1:
+        sub = str(args[1])
+        if not sub.startswith(".") and not sub.isdigit():
+            return f"{head} {sub}"
+    return head
+
+
+def attribute(frame):
+    """(component, phase) for the Python frame that issued a Tcl call."""
+    phase = None
+    component = "<app>"
+    while frame is not None:
+        code = frame.f_code
+        name = code.co_name
+        if phase is None and name in PHASES and code.co_filename.endswith("vdom.py"):
+            phase = PHASES[name]
+        if name in ("update", "unmount"):
+            mount = frame.f_locals.get("self")
+            render_fn = getattr(mount, "render_fn", None)
+            if render_fn is not None:
+                component = render_fn.__qualname__.split(".", 1)[0]
+                break
+        frame = frame.f_back
+    return component, phase or "other"
+
+
+class _TkProxy:
+    """Stands in for a tkapp object and reports call()/eval() to the profiler."""
+
+    def __init__(self, tkapp, profiler):
+        self._tkapp = tkapp
+        self._profiler = profiler
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        start = time.perf_counter()
+        try:
+            return self._tkapp.call(*args)
+        finally:
+            self._profiler.record(args, time.perf_counter() - start)
+
+    def eval(self, script):
+        start = time.perf_counter()
+        try:
+            return self._tkapp.eval(script)
+        finally:
+            self._profiler.record(script.split(None, 2), time.perf_counter() - start)
+
+    def __getattr__(self, name):
+        return getattr(self._tkapp, name)
+
+
+class TclProfiler:
+    def __init__(self, root):
+        self.root = root
+        self.tkapp = root.tk
+        self.proxy = None
+        self.frame_index = 0
+        # frames[i][(component, phase, command)] = [count, seconds]
+        self.frames = [defaultdict(lambda: [0, 0.0])]
+
+    def install(self):
+        """Route every existing and future widget's Tcl traffic through us."""
+        if self.proxy is None:
+            self.proxy = _TkProxy(self.tkapp, self)
+            self._retarget(self.root, self.proxy)
+
+    def uninstall(self):
+        if self.proxy is not None:
+            self._retarget(self.root, self.tkapp)
+            self.proxy = None
+
+    def _retarget(self, widget, tkapp):
+        widget.tk = tkapp
+        for child in list(getattr(widget, "children", {}).values()):
+            if isinstance(child, Misc):
+                self._retarget(child, tkapp)
+
+    def record(self, args, elapsed):
+        component, phase = attribute(sys._getframe(2))
+        if command_name(args) == "destroy":
+            phase = "destroy"
+        entry = self.frames[-1][(component, phase, command_name(args))]
+        entry[0] += 1
+        entry[1] += elapsed
+
+    def next_frame(self):
+        """Close the current frame; later calls are reported separately."""
+        self.frames.append(defaultdict(lambda: [0, 0.0]))
+        self.frame_index += 1
+
+    def totals(self):
+        """{(component, phase, command): [count, seconds]} over all frames."""
+        out = defaultdict(lambda: [0, 0.0])
+        for frame in self.frames:
+            for key, (count, seconds) in frame.items():
+                out[key][0] += count
+                out[key][1] += seconds
+        return dict(out)
+
+    def report(self, top=20, file=None):
+        file = file or sys.stdout
+        rows = sorted(self.totals().items(), key=lambda kv: -kv[1][1])
+        print(f"{'component':<16} {'phase':<8} {'command':<24} {'calls':>7} {'ms':>9}", file=file)
+        for (component, phase, command), (count, seconds) in rows[:top]:
+            print(
+                f"{component:<16} {phase:<8} {command:<24} {count:>7} "
+                f"{seconds * 1000:>9.2f}",
+                file=file,
+            )
+
+    def dump_folded(self, path, per_frame=True):
+        """Write collapsed stacks ("frame;component;phase;command usec")."""
+        with open(path, "w") as f:
+            for index, frame in enumerate(self.frames):
+                for (component, phase, command), (_, seconds) in frame.items():
+                    stack = [component, phase, command]
+                    if per_frame:
+                        stack.insert(0, f"frame {index}")
+                    usec = max(1, round(seconds * 1_000_000))
+                    f.write(";".join(stack) + f" {usec}\n")
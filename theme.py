@@ -1,6 +1,17 @@
 # theme.py
 # Two-color ttk theme: White & Light Ink Blue, high-contrast mono font.
 # Bigger padded focus ring, and tabs do not change size when selected.
+#
+#   use_theme(root)            # startup: the whole theme in one Tcl eval
+#   use_theme(root, "dark")    # later: only the options that differ
+#
+# A theme is a declarative spec (theme_spec) built from a palette. Each
+# variant is compiled once into a single Tcl script of `ttk::style`
+# commands, and switches between two variants are compiled once into a
+# script holding just the delta, so applying a theme is always one
+# round trip. Classic Tk widgets (Listbox, Text, Canvas) do not follow ttk
+# styles; the script recolors existing ones and sets option-database
+# defaults for new ones.
 
 import tkinter as tk
 from tkinter import ttk
@@ -13,220 +24,227 @@ BIG_IPAD = 12
 FONT_FAMILY = "Cascadia Mono"
 BASE_FONT = (FONT_FAMILY, 12)
 
-def create_two_color_theme(root: tk.Tk) -> ttk.Style:
-    style = ttk.Style(root)
-    style.theme_use("clam")
-
-    root.configure(bg=WHITE)
-
-    style.configure(
-        ".",
-        background=WHITE,
-        foreground=LIGHT_INK_BLUE,
-        fieldbackground=WHITE,
-        bordercolor=LIGHT_INK_BLUE,
-        focuscolor=LIGHT_INK_BLUE,
-        lightcolor=WHITE,
-        darkcolor=LIGHT_INK_BLUE,
-        troughcolor=WHITE,
-        padding=BIG_PAD // 2,
-        font=BASE_FONT,
-    )
-
-    style.configure("TFrame", background=WHITE, borderwidth=0, relief="flat")
-
-    style.configure(
-        "TLabel",
-        background=WHITE,
-        foreground=LIGHT_INK_BLUE,
-        padding=(0, BIG_PAD // 2),
-        font=(FONT_FAMILY, 12, "bold"),
-    )
-
-    style.configure(
-        "TButton",
-        background=WHITE,
-        foreground=LIGHT_INK_BLUE,
-        borderwidth=2,
-        relief="ridge",
-        padding=(BIG_PAD, BIG_IPAD),
-        focusthickness=3,
-        focuscolor=LIGHT_INK_BLUE,
-        font=(FONT_FAMILY, 12, "bold"),
-    )
-    style.map(
-        "TButton",
-        background=[("active", WHITE), ("pressed", WHITE)],
-        foreground=[("disabled", LIGHT_INK_BLUE)],
-        bordercolor=[("focus", LIGHT_INK_BLUE), ("!focus", LIGHT_INK_BLUE)],
-        relief=[("pressed", "sunken"), ("!pressed", "ridge")],
-        padding=[
-            ("focus", (BIG_PAD + 6, BIG_IPAD + 4)),
-            ("!focus", (BIG_PAD, BIG_IPAD)),
-        ],
-    )
-
-    style.configure(
-        "TEntry",
-        foreground=LIGHT_INK_BLUE,
-        fieldbackground=WHITE,
-        insertcolor=LIGHT_INK_BLUE,
-        borderwidth=2,
-        relief="solid",
-        padding=(BIG_PAD, BIG_IPAD),
-        font=(FONT_FAMILY, 12),
-    )
-    style.map(
-        "TEntry",
-        padding=[
-            ("focus", (BIG_PAD + 6, BIG_IPAD + 4)),
-            ("!focus", (BIG_PAD, BIG_IPAD)),
-        ],
-        bordercolor=[("focus", LIGHT_INK_BLUE)],
-    )
-
-    style.configure(
-        "TCombobox",
-        foreground=LIGHT_INK_BLUE,
-        fieldbackground=WHITE,
-        background=WHITE,
-        borderwidth=2,
-        relief="solid",
-        padding=(BIG_PAD, BIG_IPAD),
-        arrowsize=16,
-        font=(FONT_FAMILY, 12),
-    )
-    style.map(
-        "TCombobox",
-        fieldbackground=[("readonly", WHITE)],
-        foreground=[("readonly", LIGHT_INK_BLUE)],
-        background=[("readonly", WHITE)],
-    )
-
-    style.configure(
-        "TCheckbutton",
-        background=WHITE,
-        foreground=LIGHT_INK_BLUE,
-        padding=(BIG_PAD, BIG_IPAD),
-        font=(FONT_FAMILY, 12),
-    )
-
-    style.configure(
-        "TRadiobutton",
-        background=WHITE,
-        foreground=LIGHT_INK_BLUE,
-        padding=(BIG_PAD, BIG_IPAD),
-        font=(FONT_FAMILY, 12),
-    )
-
-    style.configure("TNotebook", background=WHITE, borderwidth=0)
-
-    constant_tab_pad = (BIG_PAD + 12, BIG_IPAD + 8)
-    style.configure(
-        "TNotebook.Tab",
-        background=WHITE,
-        foreground=LIGHT_INK_BLUE,
-        padding=constant_tab_pad,
-        borderwidth=2,
-        font=(FONT_FAMILY, 12, "bold"),
-        focusthickness=3,
-    )
-
-    style.layout(
-        "TNotebook.Tab",
-        [
-            (
-                "Notebook.tab",
-                {
-                    "sticky": "nswe",
-                    "children": [
-                        (
-                            "Notebook.padding",
-                            {
-                                "sticky": "nswe",
-                                "children": [
-                                    (
-                                        "Notebook.focus",
-                                        {
-                                            "sticky": "nswe",
-                                            "children": [
-                                                ("Notebook.label", {"sticky": ""})
-                                            ],
-                                        },
-                                    )
-                                ],
-                            },
-                        )
-                    ],
+PALETTES = {
+    "light": {"background": WHITE, "ink": LIGHT_INK_BLUE},
+    "dark": {"background": "#10192a", "ink": "#9ec1f0"},
+    "high-contrast": {"background": "#000000", "ink": "#FFFF00"},
+}
+
+_SCRIPTS = {}  # variant -> full script
+_DELTAS = {}  # (from variant, to variant) -> delta script
+
+# Recolors existing classic widgets below a window, in Tcl
+RETINT_PROC = """namespace eval ::rtk {}
+proc ::rtk::retint {w bg fg} {
+    foreach c [winfo children $w] {
+        switch -- [winfo class $c] {
+            Listbox - Text {$c configure -background $bg -foreground $fg}
+            Canvas {$c configure -background $bg}
+        }
+        ::rtk::retint $c $bg $fg
+    }
+}"""
+
+# Tabs keep the same layout whether selected or not
+TAB_LAYOUT = [
+    ("Notebook.tab", {"sticky": "nswe", "children": [
+        ("Notebook.padding", {"sticky": "nswe", "children": [
+            ("Notebook.focus", {"sticky": "nswe", "children": [
+                ("Notebook.label", {"sticky": ""}),
+            ]}),
+        ]}),
+    ]}),
+]
+
+
+def theme_spec(palette):
+    """Declarative two-color theme for `palette`."""
+    bg, ink = palette["background"], palette["ink"]
+    pad = (BIG_PAD, BIG_IPAD)
+    focus_pad = (BIG_PAD + 6, BIG_IPAD + 4)
+    tab_pad = (BIG_PAD + 12, BIG_IPAD + 8)
+    bold = (FONT_FAMILY, 12, "bold")
+    return {
+        "parent": "clam",
+        "root": {"background": bg, "highlightthickness": 2, "highlightcolor": ink},
+        "classic": {"background": bg, "foreground": ink},
+        "options": {
+            "*Font": BASE_FONT,
+            "*Listbox.background": bg, "*Listbox.foreground": ink,
+            "*Text.background": bg, "*Text.foreground": ink,
+            "*Canvas.background": bg,
+        },
+        "styles": {
+            ".": {"configure": {
+                "background": bg, "foreground": ink, "fieldbackground": bg,
+                "bordercolor": ink, "focuscolor": ink, "lightcolor": bg,
+                "darkcolor": ink, "troughcolor": bg, "padding": BIG_PAD // 2,
+                "font": BASE_FONT,
+            }},
+            "TFrame": {"configure": {
+                "background": bg, "borderwidth": 0, "relief": "flat",
+            }},
+            "TLabel": {"configure": {
+                "background": bg, "foreground": ink,
+                "padding": (0, BIG_PAD // 2), "font": bold,
+            }},
+            "TButton": {
+                "configure": {
+                    "background": bg, "foreground": ink, "borderwidth": 2,
+                    "relief": "ridge", "padding": pad, "focusthickness": 3,
+                    "focuscolor": ink, "font": bold,
+                },
+                "map": {
+                    "background": [("active", bg), ("pressed", bg)],
+                    "foreground": [("disabled", ink)],
+                    "bordercolor": [("focus", ink)],
+                    "relief": [("pressed", "sunken"), ("!pressed", "ridge")],
+                    "padding": [("focus", focus_pad), ("!focus", pad)],
+                },
+            },
+            "TEntry": {
+                "configure": {
+                    "foreground": ink, "fieldbackground": bg,
+                    "insertcolor": ink, "borderwidth": 2, "relief": "solid",
+                    "padding": pad, "font": BASE_FONT,
+                },
+                "map": {
+                    "padding": [("focus", focus_pad), ("!focus", pad)],
+                    "bordercolor": [("focus", ink)],
+                },
+            },
+            "TCombobox": {
+                "configure": {
+                    "foreground": ink, "fieldbackground": bg, "background": bg,
+                    "borderwidth": 2, "relief": "solid", "padding": pad,
+                    "arrowsize": 16, "font": BASE_FONT,
+                },
+                "map": {
+                    "fieldbackground": [("readonly", bg)],
+                    "foreground": [("readonly", ink)],
+                    "background": [("readonly", bg)],
+                },
+            },
+            "TCheckbutton": {"configure": {
+                "background": bg, "foreground": ink, "padding": pad,
+                "font": BASE_FONT,
+            }},
+            "TRadiobutton": {"configure": {
+                "background": bg, "foreground": ink, "padding": pad,
+                "font": BASE_FONT,
+            }},
+            "TNotebook": {"configure": {"background": bg, "borderwidth": 0}},
+            "TNotebook.Tab": {
+                "configure": {
+                    "background": bg, "foreground": ink, "padding": tab_pad,
+                    "borderwidth": 2, "font": bold, "focusthickness": 3,
                 },
-            )
-        ],
-    )
-
-    style.map(
-        "TNotebook.Tab",
-        background=[("selected", WHITE)],
-        foreground=[("selected", LIGHT_INK_BLUE)],
-        bordercolor=[("selected", LIGHT_INK_BLUE), ("!selected", LIGHT_INK_BLUE)],
-        padding=[("selected", constant_tab_pad), ("!selected", constant_tab_pad)],
-    )
-
-    style.configure(
-        "TProgressbar",
-        background=LIGHT_INK_BLUE,
-        troughcolor=WHITE,
-        bordercolor=WHITE,
-        lightcolor=LIGHT_INK_BLUE,
-        darkcolor=LIGHT_INK_BLUE,
-        thickness=20,
-    )
-
-    style.configure(
-        "TScrollbar",
-        background=LIGHT_INK_BLUE,
-        troughcolor=WHITE,
-        bordercolor=WHITE,
-        arrowcolor=WHITE,
-        relief="flat",
-    )
-    style.map(
-        "TScrollbar",
-        background=[("active", LIGHT_INK_BLUE)],
-        arrowcolor=[("active", WHITE)],
-    )
-
-    return style
-
-def apply_focus_bigger(style: ttk.Style, root: tk.Tk):
-    root.configure(highlightthickness=2, highlightcolor=LIGHT_INK_BLUE)
-    style.configure(".", focuscolor=LIGHT_INK_BLUE)
-
-    style.configure("TButton", focusthickness=3)
-    style.map(
-        "TButton",
-        padding=[
-            ("focus", (BIG_PAD + 6, BIG_IPAD + 4)),
-            ("!focus", (BIG_PAD, BIG_IPAD)),
-        ],
-        bordercolor=[("focus", LIGHT_INK_BLUE)],
-    )
-
-    style.configure("TEntry", borderwidth=2, relief="solid")
-    style.map(
-        "TEntry",
-        padding=[
-            ("focus", (BIG_PAD + 6, BIG_IPAD + 4)),
-            ("!focus", (BIG_PAD, BIG_IPAD)),
-        ],
-        bordercolor=[("focus", LIGHT_INK_BLUE)],
-    )
-
-    style.configure("TNotebook.Tab", focusthickness=3)
-    style.map(
-        "TNotebook.Tab",
-        bordercolor=[("focus", LIGHT_INK_BLUE)],
-        padding=[
-            ("focus", (BIG_PAD + 12, BIG_IPAD + 8)),
-            ("!focus", (BIG_PAD + 12, BIG_IPAD + 8)),
-        ],
-    )
\ No newline at end of file
+                "map": {
+                    "background": [("selected", bg)],
+                    "foreground": [("selected", ink)],
+                    "bordercolor": [("focus", ink)],
+                    "padding": [("focus", tab_pad), ("!focus", tab_pad)],
+                },
+                "layout": TAB_LAYOUT,
+            },
+            "TProgressbar": {"configure": {
+                "background": ink, "troughcolor": bg, "bordercolor": bg,
+                "lightcolor": ink, "darkcolor": ink, "thickness": 20,
+            }},
+            "TScrollbar": {
+                "configure": {
+                    "background": ink, "troughcolor": bg, "bordercolor": bg,
+                    "arrowcolor": bg, "relief": "flat",
+                },
+                "map": {
+                    "background": [("active", ink)],
+                    "arrowcolor": [("active", bg)],
+                },
+            },
+        },
+    }
+
+
+def _diff(new, old):
+    """The parts of spec `new` that differ from spec `old`.
+
+    Variants come from one builder, so they define the same options; an
+    option only `old` defines is left as it is.
+    """
+    if new["parent"] != old["parent"]:
+        return new  # Style settings are per ttk theme; nothing carries over
+    delta = {"styles": {}}
+    for section in ("root", "options"):
+        changed = {
+            k: v for k, v in new[section].items() if old[section].get(k) != v
+        }
+        if changed:
+            delta[section] = changed
+    if new["classic"] != old["classic"]:
+        delta["classic"] = new["classic"]
+    for name, settings in new["styles"].items():
+        before = old["styles"].get(name, {})
+        out = {}
+        for kind in ("configure", "map"):
+            changed = {
+                k: v for k, v in settings.get(kind, {}).items()
+                if before.get(kind, {}).get(k) != v
+            }
+            if changed:
+                out[kind] = changed
+        if "layout" in settings and settings["layout"] != before.get("layout"):
+            out["layout"] = settings["layout"]
+        if out:
+            delta["styles"][name] = out
+    return delta
+
+
+def compile_theme(spec):
+    """One Tcl script applying `spec` (a full spec or a _diff)."""
+    lines = []
+    if spec.get("parent"):
+        lines.append(f"ttk::setTheme {spec['parent']}")
+    lines.append(ttk._script_from_settings(spec["styles"]))
+    if spec.get("root"):
+        options = " ".join(ttk._format_optdict(spec["root"], True))
+        lines.append(f". configure {options}")
+    for pattern, value in spec.get("options", {}).items():
+        lines.append(f"option add {pattern} {ttk._stringify(value)}")
+    if spec.get("classic"):
+        classic = spec["classic"]
+        lines.append(RETINT_PROC)
+        lines.append(
+            f"::rtk::retint . {classic['background']} {classic['foreground']}"
+        )
+    return "\n".join(line for line in lines if line)
+
+
+def theme_script(name, current=None):
+    """Cached script switching from variant `current` (None: nothing
+    applied yet) to variant `name`."""
+    if current is None:
+        script = _SCRIPTS.get(name)
+        if script is None:
+            script = _SCRIPTS[name] = compile_theme(theme_spec(PALETTES[name]))
+        return script
+    key = (current, name)
+    script = _DELTAS.get(key)
+    if script is None:
+        script = _DELTAS[key] = compile_theme(_diff(
+            theme_spec(PALETTES[name]), theme_spec(PALETTES[current])
+        ))
+    return script
+
+
+def use_theme(root: tk.Tk, name="light"):
+    """Apply theme variant `name` to `root`'s interpreter in one eval."""
+    current = getattr(root, "_theme", None)
+    if current == name:
+        return
+    root.tk.eval(theme_script(name, current))
+    root._theme = name
+
+
+def create_two_color_theme(root: tk.Tk) -> ttk.Style:
+    use_theme(root, "light")
+    return ttk.Style(root)
@@ -1,10 +1,23 @@
 # vdom.py - Updated to handle None components
 
+import itertools
 import tkinter as tk
+import tkinter.font as tkfont
+from contextlib import contextmanager
 from tkinter import ttk
 from weakref import WeakKeyDictionary
 
+import resources
+
+# Portal host -> {slot key: slot dict}, see _mount_portal
 MOUNTED = WeakKeyDictionary()
+_SLOT_SEQ = itertools.count()
+# ComponentMounts currently rendering; the innermost owns new portal slots
+_MOUNTING = []
+# (widget, manager, options) queued while a layout_batch is open
+_LAYOUT_QUEUE = None
+_PACK = {}  # Shared options for a plain pack(); never mutated
+_PACK_LAYOUT = ("pack", _PACK)  # Layout of elements without a layout prop
 
 
 class TextVNode:
@@ -23,25 +36,45 @@ class ElementVNode:
 
 
 class PortalVNode:
-    def __init__(self, host, child, key=None):
+    def __init__(self, host, child, key=None, order=0):
         self.host = host
         self.child = child
+        self.key = key  # Names the slot in `host`
+        self.order = order  # Slots are packed by (order, first mount)
+
+
+class FragmentVNode:
+    """Children rendered straight into the parent widget, without a wrapper."""
+
+    def __init__(self, children, key=None):
+        self.children = [c for c in (children or []) if c is not None]
         self.key = key
 
 
 class ComponentVNode:
-    """Special VNode for declaring a child component's location."""
+    """Special VNode for declaring a child component's location.
+
+    With a `tag`, the container is created as that element and the
+    component's root element is patched onto it (see ComponentMount), so
+    the component costs no wrapper widget. A `defer`red component is left
+    out of the first round of rtk.init_components_from_host.
+    """
 
-    def __init__(self, component_factory, key=None, extra_args=None):
+    def __init__(
+        self, component_factory, key=None, extra_args=None, tag=None, defer=False
+    ):
         self.component_factory = component_factory
         self.key = key
         self.extra_args = extra_args or []
+        self.tag = tag
+        self.defer = defer
         self._container_host: ttk.Frame | None = None
 
 
 def h(tag, props=None, children=None, key=None, memo_key=None):
     if isinstance(
-        children, (str, TextVNode, ElementVNode, PortalVNode, ComponentVNode)
+        children,
+        (str, TextVNode, ElementVNode, PortalVNode, ComponentVNode, FragmentVNode),
     ):
         children = [children]
     elif children is None:
@@ -53,13 +86,17 @@ def h(tag, props=None, children=None, key=None, memo_key=None):
     return ElementVNode(tag, props or {}, children, key, memo_key)
 
 
-def Portal(host, child, key=None):
-    return PortalVNode(host, child, key)
+def Portal(host, child, key=None, order=0):
+    return PortalVNode(host, child, key, order)
+
+
+def Fragment(children, key=None):
+    return FragmentVNode(children, key)
 
 
-def Component(component_factory, key=None, extra_args=None):
+def Component(component_factory, key=None, extra_args=None, tag=None, defer=False):
     """Factory function to create a ComponentVNode."""
-    return ComponentVNode(component_factory, key, extra_args)
+    return ComponentVNode(component_factory, key, extra_args, tag, defer)
 
 
 TAG_MAP = {
@@ -70,9 +107,237 @@ TAG_MAP = {
     "button": ttk.Button,
     "input": ttk.Entry,
     "ul": tk.Listbox,
+    "canvas": tk.Canvas,
+    "table": ttk.Treeview,
+    "log": tk.Text,
+}
+
+
+class TkBackend:
+    """Host backend that creates real tkinter/ttk widgets.
+
+    A backend maps tags to widget classes. The widgets it returns must
+    provide the subset of the tkinter widget API the reconciler uses
+    (config, pack, destroy, winfo_children, winfo_exists, bind, and
+    insert/delete/get for list and entry widgets) and a StringVar-like
+    object for controlled entries. See headless.py for an in-memory
+    implementation.
+    """
+
+    name = "tk"
+    tag_map = TAG_MAP
+    default_class = ttk.Frame
+    list_classes = (tk.Listbox,)
+    entry_classes = (ttk.Entry,)
+    canvas_classes = (tk.Canvas,)
+    table_classes = (ttk.Treeview,)
+    log_classes = (tk.Text,)
+
+    def create(self, tag, parent, **options):
+        cls = self.tag_map.get(tag, self.default_class)
+        return cls(parent, **options)
+
+    def is_list(self, w):
+        return isinstance(w, self.list_classes)
+
+    def is_entry(self, w):
+        return isinstance(w, self.entry_classes)
+
+    def is_canvas(self, w):
+        return isinstance(w, self.canvas_classes)
+
+    def is_table(self, w):
+        return isinstance(w, self.table_classes)
+
+    def is_log(self, w):
+        return isinstance(w, self.log_classes)
+
+    def string_var(self, widget):
+        return tk.StringVar(master=widget)
+
+    def named_font(self, root, name, spec):
+        return tkfont.Font(root=root, name=name, font=spec)
+
+    def photo_image(self, root, name, options):
+        return tk.PhotoImage(master=root, name=name, **options)
+
+    def delete_image(self, image):
+        try:
+            image.tk.call("image", "delete", image.name)
+        except Exception:
+            pass
+
+    def configure_style(self, root, name, options):
+        ttk.Style(root).configure(name, **options)
+
+    def pack_many(self, widgets, **options):
+        """Pack several siblings with one `pack configure w1 w2 ...`."""
+        first = widgets[0]
+        first.tk.call(
+            ("pack", "configure")
+            + tuple(w._w for w in widgets)
+            + first._options(options)
+        )
+
+    def forget_many(self, manager, widgets):
+        """Unmap widgets managed by `manager` with one `<manager> forget`."""
+        if manager == "place":
+            for w in widgets:
+                w.place_forget()
+            return
+        widgets[0].tk.call((manager, "forget") + tuple(w._w for w in widgets))
+
+    def detach(self, widgets):
+        """Drop widgets from their masters' children (and so from
+        winfo_children) ahead of destroying them."""
+        for w in widgets:
+            w.master.children.pop(w._name, None)
+
+    def count_widgets(self, widgets):
+        """Widgets in the subtrees of `widgets`, from the Python side."""
+        count = 0
+        stack = list(widgets)
+        while stack:
+            w = stack.pop()
+            count += 1
+            stack.extend(w.children.values())
+        return count
+
+    def destroy_many(self, widgets):
+        """Destroy widgets with one `destroy w1 w2 ...`, then release the
+        Python side of their subtrees as BaseWidget.destroy does."""
+        widgets[0].tk.call(("destroy",) + tuple(w._w for w in widgets))
+        stack = list(widgets)
+        while stack:
+            w = stack.pop()
+            stack.extend(w.children.values())
+            w.children.clear()
+            tk.Misc.destroy(w)  # Deletes the widget's Tcl callbacks
+
+
+BACKEND = TkBackend()
+
+
+def set_backend(backend):
+    """Switch the host backend used by create_element and patching."""
+    global BACKEND
+    flush_discarded()  # Discarded widgets belong to the old backend
+    BACKEND = backend
+
+
+def get_backend():
+    return BACKEND
+
+
+class Trampoline:
+    """Stable callable handed to Tk once per widget callback slot.
+
+    Tk registers a new Tcl command for every function passed as a command,
+    so re-rendered closures would grow the command table on each patch.
+    The trampoline is registered once; patches only swap `target`.
+    """
+
+    __slots__ = ("target",)
+
+    def __init__(self, target=None):
+        self.target = target
+
+    def __call__(self, *args):
+        if self.target is not None:
+            return self.target(*args)
+
+
+def _trampoline(w, slot, value, install):
+    """Point the widget's trampoline for `slot` at `value`.
+
+    `install(trampoline)` runs only the first time a slot gets a handler.
+    """
+    slots = getattr(w, "_callbacks", None)
+    if slots is None:
+        slots = {}
+        setattr(w, "_callbacks", slots)
+    tramp = slots.get(slot)
+    if tramp is not None:
+        tramp.target = value
+    elif value is not None:
+        tramp = slots[slot] = Trampoline(value)
+        try:
+            install(tramp)
+        except Exception:
+            pass
+
+
+# Event props handled by delegation: one binding per sequence on the "all"
+# bindtag of each toplevel; handlers are looked up on the widget (bubbling
+# up through masters) in Python, so patching a handler never touches Tk.
+EVENT_PROPS = {
+    "on_input": ("<KeyRelease>",),
+    "on_key": ("<KeyPress>",),
+    "on_click": ("<Button-1>",),
+    "on_double_click": ("<Double-Button-1>",),
+    "on_focus": ("<FocusIn>",),
+    "on_blur": ("<FocusOut>",),
+    "on_scroll": ("<MouseWheel>", "<Button-4>", "<Button-5>"),
 }
 
 
+# Props of a `table` element handled by table.py, not Treeview.configure
+TABLE_PROPS = ("columns", "rows", "sort", "on_sort", "offset")
+# Props of a `log` element handled by logview.py, not Text.configure
+LOG_PROPS = ("stream", "max_lines")
+
+
+def _toplevel(w):
+    while getattr(w, "master", None) is not None:
+        w = w.master
+    return w
+
+
+def dispatch_event(prop, event):
+    """Run the nearest `prop` handler from event.widget up to the root."""
+    w = event.widget
+    while w is not None and not isinstance(w, str):
+        handlers = getattr(w, "_handlers", None)
+        if handlers:
+            handler = handlers.get(prop)
+            if handler is not None:
+                return handler(event)
+        w = getattr(w, "master", None)
+
+
+def _ensure_delegate(w, prop):
+    root = _toplevel(w)
+    installed = getattr(root, "_delegated", None)
+    if installed is None:
+        installed = set()
+        setattr(root, "_delegated", installed)
+    if prop in installed:
+        return
+    installed.add(prop)
+    for sequence in EVENT_PROPS[prop]:
+        try:
+            root.bind_all(
+                sequence, lambda e, p=prop: dispatch_event(p, e), add="+"
+            )
+        except Exception:
+            pass
+
+
+def _set_entry_value(w, value):
+    """Controlled input: write through the entry's textvariable, and only
+    when its content differs (it usually already holds what was typed)."""
+    var = getattr(w, "_textvar", None)
+    if var is None:
+        var = BACKEND.string_var(w)
+        w.config(textvariable=var)
+        setattr(w, "_textvar", var)
+    if var.get() == value:
+        return
+    cursor = w.index("insert")
+    var.set(value)
+    w.icursor(min(cursor, len(value)))
+
+
 def set_prop(w, name, value):
     if name == "text":
         try:
@@ -80,83 +345,335 @@ def set_prop(w, name, value):
         except Exception:
             pass
     elif name == "command":
+        _trampoline(w, name, value, lambda t: w.config(command=t))
+    elif name in EVENT_PROPS:
+        handlers = getattr(w, "_handlers", None)
+        if handlers is None:
+            handlers = {}
+            setattr(w, "_handlers", handlers)
+        if value is None:
+            handlers.pop(name, None)
+        else:
+            handlers[name] = value
+            _ensure_delegate(w, name)
+    elif name in ("items", "delta") and BACKEND.is_list(w):
+        pass  # Rows are applied by create_element/patch_listbox
+    elif name in TABLE_PROPS and BACKEND.is_table(w):
+        pass  # Applied by table.mount/table.patch
+    elif name in LOG_PROPS and BACKEND.is_log(w):
+        pass  # Applied by logview.mount/logview.patch
+    elif name == "progressive":
+        pass  # Read by create_element
+    elif name == "value" and BACKEND.is_entry(w):
+        _set_entry_value(w, value or "")
+    elif name == "layout":
+        _set_layout(w, value)
+    elif name == "image":
+        resources.set_image(BACKEND, w, value)
+    elif name in ("font", "style") and value:
+        resolve = resources.font if name == "font" else resources.style
         try:
-            w.config(command=value)
+            w.config({name: resolve(BACKEND, w, value)})
         except Exception:
             pass
-    elif name == "on_input":
+    else:
         try:
-            w.bind("<KeyRelease>", value)
+            w.config({name: value})
         except Exception:
             pass
-    elif name == "value" and isinstance(w, ttk.Entry):
-        w.delete(0, tk.END)
-        w.insert(0, value or "")
+
+
+# -------------------------
+# Layout
+# -------------------------
+# The `layout` prop is {"pack" | "grid" | "place": options}; elements without
+# one are packed with Tk's defaults.
+GEOMETRY_MANAGERS = ("pack", "grid", "place")
+
+# Tk's pack defaults, restored when an option is dropped from a layout
+PACK_DEFAULTS = {
+    "side": "top", "fill": "none", "expand": 0, "anchor": "center",
+    "padx": 0, "pady": 0, "ipadx": 0, "ipady": 0,
+}
+
+
+def _parse_layout(layout):
+    if not layout:
+        return "pack", {}
+    if len(layout) != 1 or next(iter(layout)) not in GEOMETRY_MANAGERS:
+        print(f"Invalid layout {layout!r}, using pack")
+        return "pack", {}
+    manager, options = next(iter(layout.items()))
+    return manager, dict(options or {})
+
+
+def _set_layout(w, layout):
+    manager, options = _parse_layout(layout)
+    old = getattr(w, "_layout", None)
+    setattr(w, "_layout", (manager, options))
+    if old is not None:
+        old_manager, old_options = old
+        dropped = set(old_options) - set(options)
+        if old_manager != manager:
+            try:
+                getattr(w, old_manager + "_forget")()
+            except Exception:
+                pass
+        elif dropped and manager == "pack":
+            # pack_forget would lose the packing order
+            options = {
+                **{k: PACK_DEFAULTS[k] for k in dropped if k in PACK_DEFAULTS},
+                **options,
+            }
+        elif dropped:
+            try:
+                getattr(w, manager + "_forget")()
+            except Exception:
+                pass
+    _layout(w, manager, options)
+
+
+def _apply_layout(w, manager, options):
+    try:
+        getattr(w, manager + "_configure")(**options)
+    except Exception:
+        pass
+
+
+def _layout(w, manager, options):
+    if _LAYOUT_QUEUE is not None:
+        _LAYOUT_QUEUE.append((w, manager, options))
     else:
+        _apply_layout(w, manager, options)
+
+
+@contextmanager
+def layout_batch():
+    """Queue geometry calls made inside the block and issue them at exit.
+
+    Calls are grouped per master, and runs of siblings packed with the same
+    options become a single `pack` command. Nested batches join the
+    outermost one.
+    """
+    global _LAYOUT_QUEUE
+    if _LAYOUT_QUEUE is not None:
+        yield
+        return
+    queue = _LAYOUT_QUEUE = []
+    try:
+        yield
+    finally:
+        _LAYOUT_QUEUE = None
+        _flush_layout(queue)
+
+
+def _flush_layout(queue):
+    if _DOOMED:
+        # Widgets discarded in this commit must not be packed again
+        queue = [e for e in queue if not getattr(e[0], "_discarded", False)]
+    if not queue:
+        return
+    # Only the order among siblings matters, so grouping by master is safe
+    by_master = {}
+    for entry in queue:
+        by_master.setdefault(entry[0].master, []).append(entry)
+
+    for entries in by_master.values():
+        run = []
+        for entry in entries:
+            if run and entry[1] == "pack" == run[0][1] and entry[2] == run[0][2]:
+                run.append(entry)
+                continue
+            _flush_run(run)
+            run = [entry]
+        _flush_run(run)
+
+
+def _flush_run(run):
+    if not run:
+        return
+    _, manager, options = run[0]
+    if len(run) > 1:
         try:
-            w.config({name: value})
+            BACKEND.pack_many([w for w, _, _ in run], **options)
+            return
+        except Exception:
+            pass  # e.g. a widget destroyed in the same commit
+    for w, _, _ in run:
+        _apply_layout(w, manager, options)
+
+
+# -------------------------
+# Deferred destruction
+# -------------------------
+# Removed widgets are unmapped and dropped from winfo_children right away,
+# then destroyed together when Tk is next idle, so a commit (a tab switch,
+# a list replacement) only waits for what it builds. The backlog is bounded
+# by the widgets it holds (descendants included), which is what its memory
+# grows with: past MAX_DISCARDED_WIDGETS a timer flush is posted as well,
+# so it is destroyed at the next turn of the event loop even if input keeps
+# Tk from going idle. Neither happens inside the commit.
+MAX_DISCARDED_WIDGETS = 10_000
+_DOOMED = []
+_doomed_widgets = 0  # Widgets in the subtrees of _DOOMED
+_urgent_flush = False  # A timer flush is posted
+
+
+def discard(widgets):
+    """Remove `widgets` from the screen and the tree now; destroy them with
+    one `destroy w1 w2 ...` at idle time."""
+    global _doomed_widgets, _urgent_flush
+    if not widgets:
+        return
+    by_manager = {}
+    for w in widgets:
+        manager = getattr(w, "_layout", _PACK_LAYOUT)[0]
+        by_manager.setdefault(manager, []).append(w)
+        w._discarded = True
+        if getattr(w, "_progressive", None) is not None:
+            import progressive
+            progressive.cancel(w)
+    for manager, group in by_manager.items():
+        try:
+            BACKEND.forget_many(manager, group)
+        except Exception:
+            pass
+    BACKEND.detach(widgets)
+    if MOUNTED:
+        # Portal content lives in its host, outside the discarded subtrees
+        for portal in _portals_in(getattr(w, "_vnode", None) for w in widgets):
+            _unmount_portal(portal)
+    # The flush callbacks belong to the root, not to a widget they destroy
+    root = widgets[0]
+    while getattr(root, "master", None) is not None:
+        root = root.master
+    if not _DOOMED:
+        try:
+            root.after_idle(flush_discarded)
+        except Exception:
+            pass
+    _DOOMED.extend(widgets)
+    _doomed_widgets += BACKEND.count_widgets(widgets)
+    if _doomed_widgets > MAX_DISCARDED_WIDGETS and not _urgent_flush:
+        try:
+            root.after(0, flush_discarded)
+            _urgent_flush = True
         except Exception:
             pass
 
 
+def _portals_in(vnodes):
+    """PortalVNodes anywhere in the element trees of `vnodes` (not inside
+    components, whose mounts own their portals)."""
+    stack = list(vnodes)
+    while stack:
+        vnode = stack.pop()
+        if isinstance(vnode, PortalVNode):
+            yield vnode
+        elif isinstance(vnode, (ElementVNode, FragmentVNode)):
+            stack.extend(vnode.children)
+
+
+def flush_discarded():
+    """Destroy every widget passed to discard() so far."""
+    global _doomed_widgets, _urgent_flush
+    _urgent_flush = False
+    if not _DOOMED:
+        return
+    widgets = _DOOMED[:]
+    _DOOMED.clear()
+    _doomed_widgets = 0
+    try:
+        BACKEND.destroy_many(widgets)
+    except Exception as e:
+        print(f"Error destroying widgets: {e}")
+
+
+def is_discarded(widget):
+    """Whether `widget` is in a subtree passed to discard() (it may still
+    exist until the next idle)."""
+    while widget is not None:
+        if getattr(widget, "_discarded", False):
+            return True
+        widget = getattr(widget, "master", None)
+    return False
+
+
 def is_real_widget(host):
     """Check if host is a real tkinter widget vs a collection"""
     return hasattr(host, "winfo_exists") and callable(host.winfo_exists)
 
 
-def create_element(vnode, parent):
+def create_element(vnode, parent, children=True):
+    """Create the widget for `vnode` under `parent`.
+
+    With children=False an element's child widgets are left out (its
+    items, canvas items and other non-widget content are still built);
+    see progressive.py.
+    """
     # Skip None values
     if vnode is None:
         return None
         
     if isinstance(vnode, str):
-        lbl = ttk.Label(parent, text=vnode)
-        lbl.pack()
+        lbl = BACKEND.create("span", parent, text=vnode)
+        _layout(lbl, "pack", _PACK)
         setattr(lbl, "_vnode", TextVNode(vnode))
         return lbl
 
     if isinstance(vnode, TextVNode):
-        lbl = ttk.Label(parent, text=vnode.text)
-        lbl.pack()
+        lbl = BACKEND.create("span", parent, text=vnode.text)
+        _layout(lbl, "pack", _PACK)
         setattr(lbl, "_vnode", vnode)
         return lbl
 
+    # Portals and fragments own no widget in `parent`
     if isinstance(vnode, PortalVNode):
-        anchor = ttk.Frame(parent)
-        anchor.pack()
-        setattr(anchor, "_vnode", vnode)
         _mount_portal(vnode)
-        return anchor
+        return None
+
+    if isinstance(vnode, FragmentVNode):
+        for c in vnode.children:
+            create_element(c, parent)
+        return None
 
     if isinstance(vnode, ComponentVNode):
-        container = ttk.Frame(parent)
-        container.pack(fill="both", expand=True)
+        container = _create_widget(vnode.tag or "div", parent)
+        if vnode.tag:
+            _layout(container, "pack", _PACK)
+        else:
+            _layout(container, "pack", {"fill": "both", "expand": True})
         setattr(container, "_vnode", vnode)
         setattr(container, "_component_managed", True)
         vnode._container_host = container
         return container
 
-    cls = TAG_MAP.get(vnode.tag, ttk.Frame)
-    w = cls(parent)
+    w = _create_widget(vnode.tag, parent)
     setattr(w, "_vnode", vnode)
 
-    if vnode.tag == "h2":
-        try:
-            w.config(font=("Cascadia Mono", 16, "bold"))
-        except Exception:
-            pass
-
     for k, v in vnode.props.items():
         set_prop(w, k, v)
 
-    w.pack()
-
-    if isinstance(w, tk.Listbox):
-        for c in vnode.children:
-            if c is not None:
-                text = c if isinstance(c, str) else getattr(c, "text", str(c))
-                w.insert(tk.END, text)
-    else:
+    if "layout" not in vnode.props:
+        _layout(w, "pack", _PACK)
+
+    if BACKEND.is_list(w):
+        items = listbox_items(vnode)
+        if items:
+            w.insert(tk.END, *items)
+    elif BACKEND.is_canvas(w):
+        import canvas_render  # Children become canvas items, not widgets
+        canvas_render.mount(w, vnode.children)
+    elif BACKEND.is_table(w):
+        import table
+        table.mount(w, vnode.props)
+    elif BACKEND.is_log(w):
+        import logview
+        logview.mount(w, vnode.props)
+    elif vnode.props.get("progressive"):
+        import progressive  # Children are built over several frames
+        progressive.mount(w, vnode.children, vnode.props["progressive"])
+    elif children:
         for c in vnode.children:
             if c is not None:
                 create_element(c, w)
@@ -164,6 +681,144 @@ def create_element(vnode, parent):
     return w
 
 
+def has_widget_children(w, vnode):
+    """Whether create_element builds `vnode`'s children as widgets of `w`."""
+    return not (
+        BACKEND.is_list(w) or BACKEND.is_canvas(w) or BACKEND.is_table(w)
+        or BACKEND.is_log(w) or vnode.props.get("progressive")
+    )
+
+
+# Fonts (resources.FONTS keys) given to elements at creation
+TAG_FONTS = {"h2": "heading"}
+
+
+def _create_widget(tag, parent):
+    font = TAG_FONTS.get(tag)
+    if font is not None:
+        try:
+            return BACKEND.create(
+                tag, parent, font=resources.font(BACKEND, parent, font)
+            )
+        except Exception:
+            pass
+    return BACKEND.create(tag, parent)
+
+
+def listbox_items(vnode):
+    # An "items" sequence (e.g. columns.ColumnView) takes the place of
+    # children so rows need not be materialized as vnodes.
+    items = getattr(vnode, "props", {}).get("items")
+    if items is not None:
+        return items
+    return [
+        c.text if isinstance(c, TextVNode) else c if isinstance(c, str) else str(c)
+        for c in getattr(vnode, "children", [])
+        if c is not None
+    ]
+
+
+# Above this many separate runs a single delete + insert is cheaper.
+MAX_LISTBOX_RUNS = 32
+
+
+def _subsequence_gaps(short, long):
+    """Indices of `long` not matched when `short` is a subsequence of it."""
+    gaps = []
+    j = 0
+    n = len(short)
+    for i, item in enumerate(long):
+        if j < n and item == short[j]:
+            j += 1
+        else:
+            gaps.append(i)
+            if len(gaps) > len(long) - n:
+                return None
+    return gaps if j == n else None
+
+
+def _runs(indices):
+    runs = []
+    for i in indices:
+        if runs and runs[-1][1] == i - 1:
+            runs[-1][1] = i
+        else:
+            runs.append([i, i])
+    return runs
+
+
+def patch_listbox(widget, old_items, new_items, delta=None):
+    """Turn old_items into new_items in a Listbox with as few calls as we can.
+
+    A `delta` (filtering.FilterDelta) computed from old_items to new_items
+    gives the rows to delete and insert directly. Otherwise the common
+    prefix and suffix are kept. If the rest only lost (or only gained)
+    items, just those runs are deleted (or inserted); otherwise the middle
+    is replaced with one delete and one insert.
+    """
+    if (
+        delta is not None
+        and delta.base is old_items
+        and delta.target is new_items
+    ):
+        _apply_listbox_delta(widget, new_items, delta)
+        return
+    if old_items == new_items:
+        return
+
+    start = 0
+    limit = min(len(old_items), len(new_items))
+    while start < limit and old_items[start] == new_items[start]:
+        start += 1
+    old_end, new_end = len(old_items), len(new_items)
+    while (
+        old_end > start
+        and new_end > start
+        and old_items[old_end - 1] == new_items[new_end - 1]
+    ):
+        old_end -= 1
+        new_end -= 1
+
+    old_mid = old_items[start:old_end]
+    new_mid = new_items[start:new_end]
+
+    if len(new_mid) < len(old_mid):
+        gaps = _subsequence_gaps(new_mid, old_mid)
+        if gaps is not None:
+            runs = _runs(gaps)
+            if len(runs) <= MAX_LISTBOX_RUNS:
+                for first, last in reversed(runs):
+                    widget.delete(start + first, start + last)
+                return
+    elif len(new_mid) > len(old_mid):
+        gaps = _subsequence_gaps(old_mid, new_mid)
+        if gaps is not None:
+            runs = _runs(gaps)
+            if len(runs) <= MAX_LISTBOX_RUNS:
+                for first, last in runs:
+                    widget.insert(start + first, *new_mid[first:last + 1])
+                return
+
+    if old_mid:
+        widget.delete(start, start + len(old_mid) - 1)
+    if new_mid:
+        widget.insert(start, *new_mid)
+
+
+def _apply_listbox_delta(widget, new_items, delta):
+    removed, added = _runs(delta.removed), _runs(delta.added)
+    if len(removed) + len(added) > MAX_LISTBOX_RUNS:
+        widget.delete(0, tk.END)
+        if new_items:
+            widget.insert(0, *new_items)
+        return
+    # Positions in the old list, then in the new one
+    for first, last in reversed(removed):
+        widget.delete(first, last)
+    for first, last in added:
+        widget.insert(first, *new_items[first:last + 1])
+
+
 def same_node(a, b):
     # Handle None values
     if a is None or b is None:
@@ -178,7 +833,7 @@ def same_node(a, b):
     if isinstance(a, PortalVNode):
         return a.key is not None and a.key == b.key
     if isinstance(a, ComponentVNode):
-        return a.key is not None and a.key == b.key
+        return a.key is not None and a.key == b.key and a.tag == b.tag
     if hasattr(a, "key") and hasattr(b, "key"):
         if a.key is not None or b.key is not None:
             return a.key == b.key and getattr(a, "tag", None) == getattr(
@@ -189,8 +844,10 @@ def same_node(a, b):
 
 def nodes_equal(a, b):
     # Handle None values
+    if a is b:
+        return True
     if a is None or b is None:
-        return a is b
+        return False
         
     if type(a) is not type(b):
         return False
@@ -205,14 +862,26 @@ def nodes_equal(a, b):
         return (
             a.key == b.key
             and a.host == b.host
+            and a.order == b.order
             and nodes_equal(a.child, b.child)
         )
 
     if isinstance(a, ComponentVNode):
-        return a.key == b.key and a.component_factory == b.component_factory
+        return (
+            a.key == b.key
+            and a.component_factory == b.component_factory
+            and a.tag == b.tag
+        )
+
+    if isinstance(a, FragmentVNode):
+        return len(a.children) == len(b.children) and all(
+            nodes_equal(x, y) for x, y in zip(a.children, b.children)
+        )
 
     if isinstance(a, ElementVNode):
-        if a.memo_key and b.memo_key and a.memo_key == b.memo_key:
+        # MemoKey compares in O(1) for scalar deps and by identity for
+        # everything else; a match skips the whole subtree.
+        if a.memo_key is not None and a.memo_key == b.memo_key:
             return True
 
         if (
@@ -272,65 +941,93 @@ def patch_widget(widget, old_vnode, new_vnode):
             set_prop(widget, "text", new_text)
         return True
 
-    if isinstance(new_vnode, PortalVNode):
-        _mount_portal(new_vnode)
-        return True
-
     if isinstance(new_vnode, ComponentVNode):
         new_vnode._container_host = widget
         return True
 
     if isinstance(new_vnode, ElementVNode):
-        old_props = getattr(old_vnode, "props", {})
-        new_props = new_vnode.props
-
-        for key in set(old_props.keys()) | set(new_props.keys()):
-            if old_props.get(key) != new_props.get(key):
-                set_prop(widget, key, new_props.get(key))
-
-        if isinstance(widget, tk.Listbox):
-            old_items = [
-                (
-                    c.text
-                    if isinstance(c, TextVNode)
-                    else c if isinstance(c, str) else str(c)
-                )
-                for c in getattr(old_vnode, "children", [])
-                if c is not None
-            ]
-            new_items = [
-                (
-                    c.text
-                    if isinstance(c, TextVNode)
-                    else c if isinstance(c, str) else str(c)
-                )
-                for c in new_vnode.children
-                if c is not None
-            ]
-
-            if old_items != new_items:
-                widget.delete(0, tk.END)
-                for item in new_items:
-                    widget.insert(tk.END, item)
-        else:
-            patch_children(
-                widget,
-                getattr(old_vnode, "children", []),
-                new_vnode.children,
-            )
-
+        _patch_element(widget, old_vnode, new_vnode)
         return True
 
     return False
 
 
+def _patch_element(widget, old_vnode, new_vnode):
+    """Patch props and children of `widget` from old_vnode to new_vnode."""
+    old_props = getattr(old_vnode, "props", {})
+    new_props = new_vnode.props
+
+    for key in set(old_props.keys()) | set(new_props.keys()):
+        if old_props.get(key) != new_props.get(key):
+            set_prop(widget, key, new_props.get(key))
+
+    if BACKEND.is_list(widget):
+        patch_listbox(
+            widget, listbox_items(old_vnode), listbox_items(new_vnode),
+            new_props.get("delta"),
+        )
+    elif BACKEND.is_canvas(widget):
+        import canvas_render
+        canvas_render.patch(widget, new_vnode.children)
+    elif BACKEND.is_table(widget):
+        import table
+        table.patch(widget, old_props, new_props)
+    elif BACKEND.is_log(widget):
+        import logview
+        logview.patch(widget, old_props, new_props)
+    elif getattr(widget, "_progressive", None) is not None:
+        import progressive  # Still mounting; applied when the mount ends
+        progressive.patch(widget, new_vnode.children)
+    else:
+        patch_children(
+            widget,
+            getattr(old_vnode, "children", []),
+            new_vnode.children,
+        )
+
+
+def _flatten(children):
+    """Children with fragments expanded in place and None values dropped."""
+    out = []
+    for c in children:
+        if isinstance(c, FragmentVNode):
+            out.extend(_flatten(c.children))
+        elif c is not None:
+            out.append(c)
+    return out
+
+
+def _patch_portals(old_portals, new_portals):
+    slots = set()
+    for portal in new_portals:
+        _mount_portal(portal)
+        slots.add((id(portal.host), portal.key))
+    for portal in old_portals:
+        if (id(portal.host), portal.key) not in slots:
+            _unmount_portal(portal)
+
+
+def _split_portals(children):
+    widgets, portals = [], []
+    for c in children:
+        (portals if isinstance(c, PortalVNode) else widgets).append(c)
+    return widgets, portals
+
+
 def patch_children(parent_widget, old_children, new_children):
     if not parent_widget or not parent_widget.winfo_exists():
         return
 
-    # Filter out None values
-    old_children = [c for c in old_children if c is not None]
-    new_children = [c for c in new_children if c is not None]
+    # Widgets of a fragment's children are direct children of parent_widget,
+    # so the fragment's range is just its slice of the flattened list.
+    old_children = _flatten(old_children)
+    new_children = _flatten(new_children)
+
+    # Portals own no widget here; their content lives in their host
+    if any(isinstance(c, PortalVNode) for c in old_children + new_children):
+        old_children, old_portals = _split_portals(old_children)
+        new_children, new_portals = _split_portals(new_children)
+        _patch_portals(old_portals, new_portals)
 
     current_widgets = parent_widget.winfo_children()
 
@@ -348,9 +1045,7 @@ def patch_children(parent_widget, old_children, new_children):
                         patch_recursive(parent_widget, old_child, new_child, i)
             return
 
-    for widget in current_widgets:
-        if widget.winfo_exists():
-            widget.destroy()
+    discard([w for w in current_widgets if w.winfo_exists()])
 
     for child_vnode in new_children:
         if child_vnode is not None:
@@ -371,11 +1066,17 @@ def patch_recursive(parent, old_vnode, new_vnode, index=0):
     if nodes_equal(old_vnode, new_vnode):
         return new_vnode
 
+    if isinstance(old_vnode, (FragmentVNode, PortalVNode)) or isinstance(
+        new_vnode, (FragmentVNode, PortalVNode)
+    ):
+        patch_children(parent, [old_vnode], [new_vnode])
+        return new_vnode
+
     widget = find_widget_for_vnode(parent, old_vnode or new_vnode, index)
 
     if new_vnode is None:
         if widget and widget.winfo_exists():
-            widget.destroy()
+            discard([widget])
         return None
 
     if old_vnode is None:
@@ -384,7 +1085,7 @@ def patch_recursive(parent, old_vnode, new_vnode, index=0):
 
     if not same_node(old_vnode, new_vnode):
         if widget and widget.winfo_exists():
-            widget.destroy()
+            discard([widget])
         create_element(new_vnode, parent)
         return new_vnode
 
@@ -392,26 +1093,106 @@ def patch_recursive(parent, old_vnode, new_vnode, index=0):
         return new_vnode
     else:
         if widget and widget.winfo_exists():
-            widget.destroy()
+            discard([widget])
         create_element(new_vnode, parent)
         return new_vnode
 
 
 def _mount_portal(vnode):
+    """Mount or patch the slot `vnode.key` of the portal's host.
+
+    Each slot tracks its own widgets and is patched on its own, so slots
+    sharing a host (toasts, status segments) never rebuild each other.
+    """
     host = vnode.host
     if host is None or not is_real_widget(host):
         return
 
-    rec = MOUNTED.get(host)
-    if not rec:
-        for c in host.winfo_children():
-            c.destroy()
-        w = create_element(vnode.child, host)
-        MOUNTED[host] = {"widget": w, "vnode": vnode.child}
-    else:
-        old_vnode = rec["vnode"]
-        rec["vnode"] = patch_recursive(host, old_vnode, vnode.child)
-        MOUNTED[host] = rec
+    slots = MOUNTED.get(host)
+    if slots is None:
+        slots = MOUNTED[host] = {}
+    slot = slots.get(vnode.key)
+    if slot is None:
+        owner = _MOUNTING[-1] if _MOUNTING else None
+        slot = slots[vnode.key] = {
+            "vnode": None,
+            "widgets": [],
+            "order": vnode.order,
+            "seq": next(_SLOT_SEQ),
+            "owner": owner,
+        }
+        if owner is not None:
+            owner.portal_slots.add((host, vnode.key))
+    if _patch_slot(host, slot, vnode.child) or slot["order"] != vnode.order:
+        slot["order"] = vnode.order
+        _place_slot(slots, slot)
+    slot["vnode"] = vnode.child
+
+
+def _patch_slot(host, slot, child):
+    """Patch a slot's widgets to `child`; True if they were recreated."""
+    old, old_portals = _split_portals(_flatten([slot["vnode"]]))
+    new, new_portals = _split_portals(_flatten([child]))
+    if old_portals or new_portals:
+        _patch_portals(old_portals, new_portals)
+
+    widgets = slot["widgets"]
+    if len(old) == len(new) == len(widgets) and all(
+        same_node(a, b) for a, b in zip(old, new)
+    ):
+        for widget, a, b in zip(widgets, old, new):
+            if not nodes_equal(a, b) and not patch_widget(widget, a, b):
+                break
+        else:
+            return False
+
+    discard([w for w in widgets if w.winfo_exists()])
+    created = (create_element(c, host) for c in new)
+    slot["widgets"] = [w for w in created if w is not None]
+    return bool(slot["widgets"])
+
+
+def _slot_rank(slot):
+    return (slot["order"], slot["seq"])
+
+
+def _place_slot(slots, slot):
+    """Pack the slot's widgets after the previous slot's, or before the
+    next slot's when it comes first."""
+    widgets = slot["widgets"]
+    if not widgets:
+        return
+    rank = _slot_rank(slot)
+    others = [s for s in slots.values() if s is not slot and s["widgets"]]
+    before = [s for s in others if _slot_rank(s) < rank]
+    after = [s for s in others if _slot_rank(s) > rank]
+    if before:
+        anchor = max(before, key=_slot_rank)["widgets"][-1]
+        for w in widgets:
+            _layout(w, "pack", {"after": anchor})
+            anchor = w
+    elif after:
+        anchor = min(after, key=_slot_rank)["widgets"][0]
+        for w in widgets:
+            _layout(w, "pack", {"before": anchor})
+
+
+def _remove_slot(host, key):
+    slots = MOUNTED.get(host)
+    slot = slots.pop(key, None) if slots is not None else None
+    if slot is None:
+        return
+    if not slots:
+        MOUNTED.pop(host, None)
+    if slot["owner"] is not None:
+        slot["owner"].portal_slots.discard((host, key))
+    if host.winfo_exists():
+        _patch_slot(host, slot, None)
+
+
+def _unmount_portal(vnode):
+    if vnode.host is not None and is_real_widget(vnode.host):
+        _remove_slot(vnode.host, vnode.key)
 
 
 class ComponentMount:
@@ -421,6 +1202,7 @@ class ComponentMount:
         self.old_vnode = None
         self.is_real_host = is_real_widget(host)
         self.unmounted = False
+        self.portal_slots = set()  # (host, key) of portal slots we own
 
     def update(self):
         if self.unmounted:
@@ -437,7 +1219,12 @@ class ComponentMount:
                 self.unmounted = True
                 return
 
-            self.old_vnode = patch_recursive(self.host, self.old_vnode, new_vnode)
+            _MOUNTING.append(self)
+            try:
+                with layout_batch():
+                    self._commit(new_vnode)
+            finally:
+                _MOUNTING.pop()
         else:
             if isinstance(self.host, list):
                 self.host.clear()
@@ -445,17 +1232,54 @@ class ComponentMount:
                     self.host.append(new_vnode)
                 self.old_vnode = new_vnode
 
+    def _commit(self, new_vnode):
+        if self._adopts(new_vnode):
+            self.old_vnode = self._patch_adopted(new_vnode)
+        else:
+            if self._adopts(self.old_vnode):
+                self._clear_adopted()
+            self.old_vnode = patch_recursive(self.host, self.old_vnode, new_vnode)
+
+    def _adopts(self, vnode):
+        """Whether `vnode` is patched onto the host itself: the host is a
+        container declared with the same tag as the rendered root."""
+        tag = getattr(getattr(self.host, "_vnode", None), "tag", None)
+        return (
+            tag is not None
+            and isinstance(vnode, ElementVNode)
+            and vnode.tag == tag
+        )
+
+    def _patch_adopted(self, new_vnode):
+        old_vnode = self.old_vnode if self._adopts(self.old_vnode) else None
+        if old_vnode is None and self.old_vnode is not None:
+            patch_recursive(self.host, self.old_vnode, None)
+        if old_vnode is None or not nodes_equal(old_vnode, new_vnode):
+            _patch_element(self.host, old_vnode, new_vnode)
+        return new_vnode
+
+    def _clear_adopted(self):
+        empty = ElementVNode(self.old_vnode.tag)
+        _patch_element(self.host, self.old_vnode, empty)
+        self.old_vnode = None
+
     def unmount(self):
         if self.unmounted:
             return
 
         self.unmounted = True
 
+        # Portal content lives outside our host, so remove it explicitly
+        for host, key in list(self.portal_slots):
+            try:
+                _remove_slot(host, key)
+            except Exception:
+                pass
+
         if self.is_real_host:
             try:
                 if self.host.winfo_exists():
-                    for child in self.host.winfo_children():
-                        child.destroy()
+                    discard(self.host.winfo_children())
             except Exception:
                 pass
         else: